@@ -14,6 +14,7 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from datetime import datetime, timedelta
 
@@ -55,10 +56,21 @@ if 'market_data' not in st.session_state:
 # API base URL
 API_BASE = "http://127.0.0.1:8000"
 
+@st.cache_resource
+def get_api_session():
+    """Keep-alive HTTP session shared across reruns (one TCP connection, not one per call)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+api = get_api_session()
+
 def check_api_connection():
     """Check if trading interface is running"""
     try:
-        response = requests.get(f"{API_BASE}/health", timeout=2)
+        response = api.get(f"{API_BASE}/health", timeout=2)
         return response.status_code == 200
     except:
         return False
@@ -175,7 +187,7 @@ elif page == "📈 Trading Interface":
                 order_data["price"] = float(price)
             
             try:
-                response = requests.post(f"{API_BASE}/order", json=order_data)
+                response = api.post(f"{API_BASE}/order", json=order_data)
                 if response.status_code == 200:
                     result = response.json()
                     st.success(f"✅ Order submitted: {result.get('order_id')}")
@@ -192,7 +204,7 @@ elif page == "📈 Trading Interface":
         
         if refresh_book or True:
             try:
-                response = requests.get(f"{API_BASE}/book")
+                response = api.get(f"{API_BASE}/book")
                 if response.status_code == 200:
                     book = response.json()
                     
@@ -227,7 +239,7 @@ elif page == "📈 Trading Interface":
         
         if check_risk:
             try:
-                response = requests.get(f"{API_BASE}/risk/{risk_client_id}")
+                response = api.get(f"{API_BASE}/risk/{risk_client_id}")
                 if response.status_code == 200:
                     risk = response.json()
                     st.json(risk)
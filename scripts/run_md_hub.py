@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Run a market-data hub that publishes top of book to a shared-memory ring
+"""
+import sys
+import os
+import asyncio
+import argparse
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.strategies.md_ring import MidRing
+from src.strategies.strategy_client import MarketDataHub
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Publish market data to shared memory")
+    parser.add_argument("--ring-name", type=str, default="mm_md",
+                       help="Shared-memory block name (pass to run_strategy.py --md-ring)")
+    parser.add_argument("--capacity", type=int, default=1024,
+                       help="Ring capacity (records)")
+    parser.add_argument("--ws-md-url", type=str, default="ws://127.0.0.1:8000/ws/md",
+                       help="Market data WebSocket URL")
+    parser.add_argument("--client-lib", type=str, default="websockets",
+                       choices=["websockets", "picows"],
+                       help="WebSocket client library")
+    
+    args = parser.parse_args()
+    
+    ring = MidRing(name=args.ring_name, capacity=args.capacity, create=True)
+    hub = MarketDataHub(args.ws_md_url, client_lib=args.client_lib, ring=ring)
+    print(f"Publishing market data to shared memory '{ring.name}'")
+    try:
+        await hub.run()
+    finally:
+        ring.close()
+        ring.unlink()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\nStopping hub...")
@@ -14,6 +14,7 @@ from src.strategies.symmetric_mm import SymmetricMarketMaker
 from src.strategies.inventory_skew_mm import InventorySkewMarketMaker
 from src.strategies.adaptive_spread_mm import AdaptiveSpreadMarketMaker
 from src.strategies.strategy_client import StrategyClient
+from src.strategies.md_ring import MidRing
 
 
 async def main():
@@ -31,6 +32,11 @@ async def main():
                        help="Quote size")
     parser.add_argument("--quote-interval", type=float, default=0.5,
                        help="Quote update interval (seconds)")
+    parser.add_argument("--client-lib", type=str, default="websockets",
+                       choices=["websockets", "picows"],
+                       help="WebSocket client library")
+    parser.add_argument("--md-ring", type=str, default=None,
+                       help="Read top of book from a run_md_hub.py shared-memory ring")
     
     args = parser.parse_args()
     
@@ -72,7 +78,7 @@ async def main():
             tick_size=0.01,
             initial_mid=100.0
         )
-        client = RLStrategyClient(strategy)
+        client = RLStrategyClient(strategy, client_lib=args.client_lib)
         print(f"Starting RL strategy (client_id: {args.client_id}, model: {args.model_path})")
         try:
             await client.run(quote_interval=args.quote_interval)
@@ -84,7 +90,8 @@ async def main():
     print(f"Starting {args.strategy} strategy (client_id: {args.client_id})")
     
     # Run strategy
-    client = StrategyClient(strategy)
+    md_ring = MidRing(name=args.md_ring) if args.md_ring else None
+    client = StrategyClient(strategy, client_lib=args.client_lib, md_ring=md_ring)
     try:
         await client.run(quote_interval=args.quote_interval)
     except KeyboardInterrupt:
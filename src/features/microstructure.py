@@ -12,6 +12,13 @@ class MicrostructureFeatureExtractor:
     Extracts microstructure features from LOB snapshots
     """
     
+    FEATURE_ORDER = (
+        'mid', 'spread', 'relative_spread',
+        'bid_depth', 'ask_depth', 'depth_imbalance',
+        'order_flow_imbalance', 'return_1s', 'return_5s',
+        'realized_vol', 'avg_volume', 'mid_skew'
+    )
+    
     def __init__(self, lookback_window: int = 20):
         self.lookback_window = lookback_window
         self.mid_history = deque(maxlen=lookback_window)
@@ -148,16 +155,20 @@ class MicrostructureFeatureExtractor:
             'avg_volume': 0.0
         }
     
-    def get_feature_vector(self, features: Dict[str, float]) -> np.ndarray:
+    def get_feature_vector(
+        self,
+        features: Dict[str, float],
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """
         Convert feature dict to numpy array for ML models
         Order matters for consistency
+        
+        If `out` is given, features are written into it in place and it is returned.
         """
-        feature_order = [
-            'mid', 'spread', 'relative_spread',
-            'bid_depth', 'ask_depth', 'depth_imbalance',
-            'order_flow_imbalance', 'return_1s', 'return_5s',
-            'realized_vol', 'avg_volume', 'mid_skew'
-        ]
-        
-        return np.array([features.get(k, 0.0) for k in feature_order], dtype=np.float32)
+        if out is None:
+            return np.array([features.get(k, 0.0) for k in self.FEATURE_ORDER], dtype=np.float32)
+        
+        for i, k in enumerate(self.FEATURE_ORDER):
+            out[i] = features.get(k, 0.0)
+        return out
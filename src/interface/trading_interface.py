@@ -50,6 +50,37 @@ class CancelResponse(BaseModel):
     status: str
 
 
+class CancelBatchRequest(BaseModel):
+    order_ids: List[str]
+
+
+class CancelBatchResponse(BaseModel):
+    canceled: List[str]
+
+
+class QuoteSide(BaseModel):
+    price: float
+    size: int
+
+
+class ReplaceQuotesRequest(BaseModel):
+    client_id: str
+    bid: Optional[QuoteSide] = None
+    ask: Optional[QuoteSide] = None
+
+
+class QuoteResult(BaseModel):
+    order_id: Optional[str] = None
+    status: str
+    message: Optional[str] = None
+
+
+class ReplaceQuotesResponse(BaseModel):
+    canceled: List[str]
+    bid: Optional[QuoteResult] = None
+    ask: Optional[QuoteResult] = None
+
+
 class BookSnapshot(BaseModel):
     bids: List[List[float]]  # [[price, size], ...]
     asks: List[List[float]]
@@ -76,6 +107,9 @@ class TradingInterface:
         self.lob = LimitOrderBook()
         self.risk_manager = RiskManager(risk_limits)
         
+        # Resting quote order ids per client (managed by /replace_quotes)
+        self.client_quotes: Dict[str, List[str]] = defaultdict(list)
+        
         # WebSocket subscribers
         self.md_subscribers: List[WebSocket] = []
         self.fill_subscribers: Dict[str, List[WebSocket]] = defaultdict(list)
@@ -159,6 +193,8 @@ class TradingInterface:
                     "submit_order": "POST /order",
                     "get_order": "GET /order/{order_id}",
                     "cancel_order": "POST /cancel/{order_id}",
+                    "cancel_batch": "POST /cancel_batch",
+                    "replace_quotes": "POST /replace_quotes",
                     "get_fills": "GET /fills/{client_id}",
                     "get_risk": "GET /risk/{client_id}",
                     "market_data_ws": "WS /ws/md",
@@ -187,42 +223,17 @@ class TradingInterface:
             if order_req.type is None:
                 order_req.type = "limit"  # Default
             
-            # Validate order
-            mid = self.lob.mid_price()
-            valid, error = self.risk_manager.validate_order(
+            order, error = await self._place_order(
                 order_req.client_id,
                 order_req.side,
-                order_req.size,
-                order_req.price if order_req.type == "limit" else None,
-                mid
+                order_req.type,
+                order_req.price,
+                order_req.size
             )
             
-            if not valid:
+            if order is None:
                 raise HTTPException(status_code=400, detail=error)
             
-            # Create order
-            order = Order(
-                order_id=str(uuid.uuid4()),
-                client_id=order_req.client_id,
-                side=order_req.side,
-                type=order_req.type,
-                price=order_req.price,
-                size=order_req.size
-            )
-            
-            # Submit to LOB
-            fills = self.lob.add_order(order)
-            
-            # Process fills
-            for fill in fills:
-                # Update risk manager
-                self.risk_manager.update_position(
-                    fill.client_id, fill.side, fill.size, fill.price
-                )
-                
-                # Push fill to client
-                await self._push_fill(fill)
-            
             return OrderResponse(
                 order_id=order.order_id,
                 status=order.status,
@@ -242,6 +253,34 @@ class TradingInterface:
             
             return CancelResponse(order_id=order_id, status="canceled")
         
+        @self.app.post("/cancel_batch", response_model=CancelBatchResponse)
+        async def cancel_batch(req: CancelBatchRequest):
+            """Cancel several orders in one call; unknown or finished orders are skipped"""
+            return CancelBatchResponse(canceled=self.lob.cancel_orders_bulk(req.order_ids))
+        
+        @self.app.post("/replace_quotes", response_model=ReplaceQuotesResponse)
+        async def replace_quotes(req: ReplaceQuotesRequest):
+            """Cancel the client's previous quotes and post a new bid/ask in one call"""
+            previous = self.client_quotes[req.client_id]
+            canceled = [oid for oid in previous if self.lob.cancel_order(oid)]
+            previous.clear()
+            
+            results = {}
+            for name, side, quote in (("bid", "buy", req.bid), ("ask", "sell", req.ask)):
+                if quote is None:
+                    continue
+                order, error = await self._place_order(
+                    req.client_id, side, "limit", quote.price, quote.size
+                )
+                if order is None:
+                    results[name] = QuoteResult(status="rejected", message=error)
+                    continue
+                if order.status != "filled":
+                    previous.append(order.order_id)
+                results[name] = QuoteResult(order_id=order.order_id, status=order.status)
+            
+            return ReplaceQuotesResponse(canceled=canceled, **results)
+        
         @self.app.get("/book", response_model=BookSnapshot)
         async def get_book():
             """Get current order book snapshot"""
@@ -340,6 +379,59 @@ class TradingInterface:
                 if client_id in self.fill_subscribers:
                     self.fill_subscribers[client_id].remove(websocket)
     
+    async def _place_order(
+        self,
+        client_id: str,
+        side: str,
+        order_type: str,
+        price: Optional[float],
+        size: int
+    ):
+        """
+        Risk-check an order, add it to the book and dispatch its fills
+        
+        Returns (order, None) on acceptance or (None, error) on rejection.
+        """
+        # Validate order (the handle skips the id lookup on every later risk call)
+        risk_handle = self.risk_manager.register_client(client_id)
+        mid = self.lob.mid_price()
+        valid, error = self.risk_manager.validate_order(
+            risk_handle,
+            side,
+            size,
+            price if order_type == "limit" else None,
+            mid
+        )
+        
+        if not valid:
+            return None, error
+        
+        # Create order
+        order = Order(
+            order_id=str(uuid.uuid4()),
+            client_id=client_id,
+            side=side,
+            type=order_type,
+            price=price,
+            size=size
+        )
+        
+        # Submit to LOB
+        fills = self.lob.add_order(order)
+        
+        # Process fills
+        for fill in fills:
+            # Update risk manager
+            self.risk_manager.update_position(
+                risk_handle if fill.client_id == client_id else fill.client_id,
+                fill.side, fill.size, fill.price
+            )
+            
+            # Push fill to client
+            await self._push_fill(fill)
+        
+        return order, None
+    
     async def _push_fill(self, fill: Fill):
         """Push fill notification to client's WebSocket"""
         if fill.client_id in self.fill_subscribers:
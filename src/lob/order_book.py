@@ -4,7 +4,7 @@ Implements price-time priority matching with partial fills
 """
 from collections import deque, defaultdict
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional, Sequence
 import time
 import uuid
 
@@ -21,6 +21,10 @@ class Order:
     remaining_size: int = 0
     timestamp: float = field(default_factory=time.time)
     status: str = "pending"  # pending, filled, partially_filled, canceled
+    side_sign: int = field(init=False)  # +1 buy, -1 sell
+    
+    def __post_init__(self):
+        self.side_sign = 1 if self.side == "buy" else -1
 
 
 @dataclass
@@ -33,6 +37,10 @@ class Fill:
     size: int
     timestamp: float
     trade_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    side_sign: int = field(init=False)  # +1 buy, -1 sell
+    
+    def __post_init__(self):
+        self.side_sign = 1 if self.side == "buy" else -1
 
 
 class LimitOrderBook:
@@ -58,6 +66,15 @@ class LimitOrderBook:
         self.last_trade_price: Optional[float] = None
         self.last_trade_size: int = 0
         
+    def clear(self):
+        """Empty the book in place, keeping the existing containers"""
+        self.bids.clear()
+        self.asks.clear()
+        self.orders.clear()
+        self.fills.clear()
+        self.last_trade_price = None
+        self.last_trade_size = 0
+    
     def _round_price(self, price: float) -> float:
         """Round price to nearest tick"""
         return round(price / self.tick_size) * self.tick_size
@@ -225,6 +242,40 @@ class LimitOrderBook:
         
         return fills
     
+    def add_orders_bulk(
+        self,
+        side: str,
+        prices: Sequence[float],
+        sizes: Sequence[int],
+        client_id: str,
+        order_ids: Sequence[str]
+    ) -> List[Order]:
+        """
+        Rest many limit orders on one side without attempting to match
+        
+        Only for orders known not to cross the book (e.g. seeding an empty
+        book); crossing orders would be left resting instead of filled.
+        """
+        book = self.bids if side == "buy" else self.asks
+        orders = []
+        for order_id, price, size in zip(order_ids, prices, sizes):
+            price = self._round_price(float(price))
+            size = int(size)
+            order = Order(
+                order_id=order_id,
+                client_id=client_id,
+                side=side,
+                type="limit",
+                price=price,
+                size=size,
+                remaining_size=size,
+                status="active"
+            )
+            self.orders[order_id] = order
+            book[price].append((order_id, size))
+            orders.append(order)
+        return orders
+    
     def cancel_order(self, order_id: str) -> bool:
         """Cancel an order from the book"""
         if order_id not in self.orders:
@@ -252,6 +303,38 @@ class LimitOrderBook:
         order.status = "canceled"
         return True
     
+    def cancel_orders_bulk(self, order_ids: Iterable[str]) -> List[str]:
+        """
+        Cancel several orders, rebuilding each affected price level once
+        
+        Unknown, filled and already-canceled orders are skipped. Returns the
+        ids actually canceled.
+        """
+        # (book, price) -> ids to drop from that level
+        levels: Dict[Tuple[bool, float], set] = defaultdict(set)
+        canceled = []
+        for order_id in order_ids:
+            order = self.orders.get(order_id)
+            if order is None or order.status in ["filled", "canceled"]:
+                continue
+            levels[(order.side == "buy", order.price)].add(order_id)
+            order.status = "canceled"
+            canceled.append(order_id)
+        
+        for (is_bid, price), ids in levels.items():
+            book = self.bids if is_bid else self.asks
+            if price in book:
+                new_queue = deque([
+                    (oid, sz) for oid, sz in book[price]
+                    if oid not in ids
+                ])
+                if new_queue:
+                    book[price] = new_queue
+                else:
+                    del book[price]
+        
+        return canceled
+    
     def get_order(self, order_id: str) -> Optional[Order]:
         """Get order by ID"""
         return self.orders.get(order_id)
@@ -3,6 +3,7 @@ Options Pricing: Black-Scholes, Binomial, Greeks
 """
 import numpy as np
 from scipy.stats import norm
+from scipy.special import ndtr
 from typing import Dict, Literal
 import math
 
@@ -136,6 +137,35 @@ class BlackScholes:
         }
 
 
+def bs_call_put(S, K, T, r, sigma):
+    """
+    Black-Scholes call and put prices from one d1/d2 evaluation
+    
+    Arguments follow BlackScholes.price and may be scalars or arrays.
+    Returns (call, put); expired contracts (T <= 0) price at intrinsic value.
+    """
+    T = np.asarray(T, dtype=np.float64)
+    expired = T <= 0
+    T_live = np.where(expired, 1.0, T)
+    sqrt_T = np.sqrt(T_live)
+    
+    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T_live) / (sigma * sqrt_T)
+    d2 = d1 - sigma * sqrt_T
+    Nd1 = ndtr(d1)
+    Nd2 = ndtr(d2)
+    K_disc = K * np.exp(-r * T_live)
+    
+    call = S * Nd1 - K_disc * Nd2
+    # ndtr(-d), not 1 - ndtr(d): the latter cancels to 0 for deep OTM puts
+    put = K_disc * ndtr(-d2) - S * ndtr(-d1)
+    
+    if expired.any():
+        call = np.where(expired, np.maximum(S - K, 0.0), call)
+        put = np.where(expired, np.maximum(K - S, 0.0), put)
+    
+    return call[()], put[()]
+
+
 class Option:
     """Represents an option contract"""
     
@@ -3,10 +3,70 @@ Portfolio Optimization: Mean-Variance, Risk Parity, etc.
 """
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+import functools
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
 from scipy.optimize import minimize
 from dataclasses import dataclass
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback when numba is not installed: run the plain Python function"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Above this many assets, optimizers run matrix products in float32
+FLOAT32_MIN_ASSETS = 128
+
+
+def _working_dtype(n_assets: int) -> type:
+    """float32 for large universes (sgemv, half the bandwidth), float64 otherwise"""
+    return np.float32 if n_assets >= FLOAT32_MIN_ASSETS else np.float64
+
+
+@functools.lru_cache(maxsize=None)
+def _risk_parity_loss_kernel(n: int, dtype: type):
+    """
+    Risk-parity loss sum((w_i (Sw)_i / vol - target_i)^2) specialized for n assets
+    
+    n is a closure constant, so the loop bounds are known when the kernel is
+    compiled. One kernel is compiled per (universe size, dtype) and reused.
+    """
+    def loss(weights, cov, target):
+        Sw = np.empty(n)
+        var = 0.0
+        for i in range(n):
+            acc = 0.0
+            for j in range(n):
+                acc += cov[i, j] * weights[j]
+            Sw[i] = acc
+            var += weights[i] * acc
+        vol = np.sqrt(var)
+        total = 0.0
+        for i in range(n):
+            c = weights[i] * Sw[i] / vol - target[i]
+            total += c * c
+        return total
+    
+    if not NUMBA_AVAILABLE:
+        return loss
+    
+    t = "f4" if dtype == np.float32 else "f8"
+    signature = f"f8({t}[::1], {t}[:, ::1], {t}[::1])"
+    return njit(signature, fastmath=True, boundscheck=False)(loss)
+
+
+def _quadratic_form(weights: np.ndarray, covariance_matrix: np.ndarray) -> float:
+    """w' * Sigma * w"""
+    return float(weights @ (covariance_matrix @ weights))
+
 
 @dataclass
 class Portfolio:
@@ -37,11 +97,20 @@ class PortfolioOptimizer:
         Subject to: sum(w) = 1, w >= 0
         """
         n = len(expected_returns)
+        dtype = _working_dtype(n)
+        mu = np.asarray(expected_returns).astype(dtype, copy=False)
+        cov = np.asarray(covariance_matrix).astype(dtype, copy=False)
         
         def objective(weights):
-            portfolio_return = np.dot(weights, expected_returns)
-            portfolio_risk = np.sqrt(np.dot(weights.T, np.dot(covariance_matrix, weights)))
-            return -(portfolio_return - risk_aversion * portfolio_risk ** 2)
+            w = weights.astype(dtype, copy=False)
+            portfolio_return = np.dot(w, mu)
+            portfolio_risk = np.sqrt(np.dot(w, np.dot(cov, w)))
+            return -float(portfolio_return - risk_aversion * portfolio_risk ** 2)
+        
+        def gradient(weights):
+            # Analytical gradient; finite differences are too coarse in float32
+            w = weights.astype(dtype, copy=False)
+            return (2.0 * risk_aversion * np.dot(cov, w) - mu).astype(np.float64)
         
         # Constraints
         constraints = [{"type": "eq", "fun": lambda w: np.sum(w) - 1}]
@@ -55,6 +124,7 @@ class PortfolioOptimizer:
             objective,
             x0,
             method="SLSQP",
+            jac=gradient,
             bounds=bounds,
             constraints=constraints
         )
@@ -68,18 +138,29 @@ class PortfolioOptimizer:
         Equal risk contribution from each asset
         """
         n = covariance_matrix.shape[0]
+        dtype = _working_dtype(n)
+        cov = np.ascontiguousarray(covariance_matrix, dtype=dtype)
         
-        def risk_contribution(weights):
-            portfolio_vol = np.sqrt(np.dot(weights.T, np.dot(covariance_matrix, weights)))
-            marginal_contrib = np.dot(covariance_matrix, weights) / portfolio_vol
-            contrib = weights * marginal_contrib
-            return contrib
+        target_contrib = np.ones(n, dtype=dtype) / n
+        risk_parity_loss = _risk_parity_loss_kernel(n, dtype)
         
         def objective(weights):
-            contrib = risk_contribution(weights)
             # Minimize difference in risk contributions
-            target_contrib = np.ones(n) / n
-            return np.sum((contrib - target_contrib) ** 2)
+            w = np.ascontiguousarray(weights, dtype=dtype)
+            return float(risk_parity_loss(w, cov, target_contrib))
+        
+        def gradient(weights):
+            # c_i = w_i (Sw)_i / vol, so dc_i/dw_j = (d_ij (Sw)_i + w_i S_ij) / vol - c_i (Sw)_j / vol^2
+            w = weights.astype(dtype, copy=False)
+            Sw = np.dot(cov, w)
+            portfolio_vol = np.sqrt(np.dot(w, Sw))
+            contrib = w * Sw / portfolio_vol
+            resid = contrib - target_contrib
+            grad = (
+                2.0 * (resid * Sw + np.dot(cov, w * resid)) / portfolio_vol
+                - 2.0 * np.dot(resid, contrib) * Sw / portfolio_vol ** 2
+            )
+            return grad.astype(np.float64)
         
         constraints = [{"type": "eq", "fun": lambda w: np.sum(w) - 1}]
         bounds = [(0, 1) for _ in range(n)]
@@ -89,6 +170,7 @@ class PortfolioOptimizer:
             objective,
             x0,
             method="SLSQP",
+            jac=gradient,
             bounds=bounds,
             constraints=constraints
         )
@@ -101,9 +183,16 @@ class PortfolioOptimizer:
         Minimum variance portfolio
         """
         n = covariance_matrix.shape[0]
+        dtype = _working_dtype(n)
+        cov = np.asarray(covariance_matrix).astype(dtype, copy=False)
         
         def objective(weights):
-            return np.dot(weights.T, np.dot(covariance_matrix, weights))
+            w = weights.astype(dtype, copy=False)
+            return float(np.dot(w, np.dot(cov, w)))
+        
+        def gradient(weights):
+            w = weights.astype(dtype, copy=False)
+            return (2.0 * np.dot(cov, w)).astype(np.float64)
         
         constraints = [{"type": "eq", "fun": lambda w: np.sum(w) - 1}]
         bounds = [(0, 1) for _ in range(n)]
@@ -113,6 +202,7 @@ class PortfolioOptimizer:
             objective,
             x0,
             method="SLSQP",
+            jac=gradient,
             bounds=bounds,
             constraints=constraints
         )
@@ -127,7 +217,7 @@ class PortfolioOptimizer:
     ) -> Dict:
         """Calculate portfolio-level metrics"""
         portfolio_return = np.dot(weights, expected_returns)
-        portfolio_variance = np.dot(weights.T, np.dot(covariance_matrix, weights))
+        portfolio_variance = _quadratic_form(weights, covariance_matrix)
         portfolio_vol = np.sqrt(portfolio_variance)
         
         # Sharpe ratio (assuming risk-free rate = 0)
@@ -149,13 +239,31 @@ class MultiAssetMarketMaker:
     
     def __init__(self, symbols: List[str]):
         self.symbols = symbols
-        self.positions: Dict[str, float] = {s: 0.0 for s in symbols}
+        # Positions stored densely in symbol order
+        self._idx: Dict[str, int] = {s: i for i, s in enumerate(symbols)}
+        self._pos = np.zeros(len(symbols))
         self.optimizer = PortfolioOptimizer()
     
+    @property
+    def positions(self) -> Mapping[str, float]:
+        """
+        Read-only snapshot of positions by symbol
+        
+        Writes raise TypeError; use set_position / update_position.
+        """
+        return MappingProxyType({s: float(self._pos[i]) for s, i in self._idx.items()})
+    
+    def set_position(self, symbol: str, position: float):
+        """Set the position for a symbol"""
+        self._pos[self._idx[symbol]] = position
+    
+    def update_position(self, symbol: str, delta: float):
+        """Add a fill to the position for a symbol"""
+        self._pos[self._idx[symbol]] += delta
+    
     def calculate_portfolio_risk(self, covariance_matrix: np.ndarray) -> float:
         """Calculate total portfolio risk"""
-        positions_array = np.array([self.positions[s] for s in self.symbols])
-        portfolio_variance = np.dot(positions_array.T, np.dot(covariance_matrix, positions_array))
+        portfolio_variance = _quadratic_form(self._pos, covariance_matrix)
         return float(np.sqrt(portfolio_variance))
     
     def optimize_quotes(
@@ -170,33 +278,32 @@ class MultiAssetMarketMaker:
         Returns:
             Dict of symbol -> {bid_price, ask_price, bid_size, ask_size}
         """
-        quotes = {}
-        
         # Calculate current portfolio risk
         current_risk = self.calculate_portfolio_risk(covariance_matrix)
         
         # Adjust quote sizes based on portfolio risk
         risk_scale = min(1.0, target_risk / current_risk) if current_risk > 0 else 1.0
         
-        for symbol in self.symbols:
-            if symbol in market_states:
-                state = market_states[symbol]
-                mid = state.get("mid", 100.0)
-                spread = state.get("spread", 0.02)
-                
-                # Base quote
-                bid_price = mid - spread / 2
-                ask_price = mid + spread / 2
-                base_size = 1
-                
-                # Scale by risk
-                quote_size = int(base_size * risk_scale)
-                
-                quotes[symbol] = {
-                    "bid_price": round(bid_price, 2),
-                    "ask_price": round(ask_price, 2),
-                    "bid_size": quote_size,
-                    "ask_size": quote_size
-                }
-        
-        return quotes
+        quoted = [s for s in self.symbols if s in market_states]
+        n = len(quoted)
+        
+        # Base quotes for all symbols in one vectorized pass
+        mids = np.fromiter((market_states[s].get("mid", 100.0) for s in quoted), dtype=np.float64, count=n)
+        spreads = np.fromiter((market_states[s].get("spread", 0.02) for s in quoted), dtype=np.float64, count=n)
+        half_spreads = spreads * 0.5
+        bid_prices = np.round(mids - half_spreads, 2)
+        ask_prices = np.round(mids + half_spreads, 2)
+        
+        # Scale by risk
+        base_size = 1
+        quote_size = int(base_size * risk_scale)
+        
+        return {
+            symbol: {
+                "bid_price": float(bid),
+                "ask_price": float(ask),
+                "bid_size": quote_size,
+                "ask_size": quote_size
+            }
+            for symbol, bid, ask in zip(quoted, bid_prices, ask_prices)
+        }
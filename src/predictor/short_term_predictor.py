@@ -4,11 +4,19 @@ Predicts next-period signed return or adverse selection probability
 """
 import torch
 import torch.nn as nn
+from torch.utils.data import DataLoader, TensorDataset
 import numpy as np
+import io
 from typing import Optional, Tuple
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
 
+try:
+    import onnxruntime as ort
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
+
 
 class MicrostructurePredictor(nn.Module):
     """
@@ -32,6 +40,14 @@ class MicrostructurePredictor(nn.Module):
     
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         return self.network(x)
+    
+    def inference_network(self) -> nn.Sequential:
+        """
+        Linear/ReLU chain for deployment, without the Dropout layers
+        
+        Layers are shared with the training network, so no weights are copied.
+        """
+        return nn.Sequential(*[m for m in self.network if not isinstance(m, nn.Dropout)]).eval()
 
 
 class PredictorWrapper:
@@ -49,48 +65,102 @@ class PredictorWrapper:
         else:
             self.model = RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42)
         
+        # Deploy network, ONNX Runtime session and cached scaler params (set by train)
+        self._deploy: Optional[nn.Sequential] = None
+        self._ort = None
+        self._mu: Optional[np.ndarray] = None
+        self._inv_sigma: Optional[np.ndarray] = None
+        
+        # Last predict() input and output
+        self._last_key: Optional[Tuple[str, bytes]] = None
+        self._last_pred = 0.0
         self.is_trained = False
     
-    def train(self, X: np.ndarray, y: np.ndarray):
+    def train(self, X: np.ndarray, y: np.ndarray, epochs: int = 100, batch_size: int = 256):
         """Train the predictor"""
         # Scale features
         X_scaled = self.scaler.fit_transform(X)
+        self._last_key = None
+        
+        # Cache the affine scaling params so inference skips sklearn's validation
+        self._mu = self.scaler.mean_.astype(np.float32)
+        self._inv_sigma = (1.0 / self.scaler.scale_).astype(np.float32)
         
         if self.model_type == "nn":
-            # Convert to tensors
-            X_tensor = torch.FloatTensor(X_scaled)
-            y_tensor = torch.FloatTensor(y).reshape(-1, 1)
+            # Mini-batches over tensors sharing memory with the numpy arrays
+            dataset = TensorDataset(
+                torch.from_numpy(np.ascontiguousarray(X_scaled, dtype=np.float32)),
+                torch.from_numpy(np.ascontiguousarray(y, dtype=np.float32)).reshape(-1, 1)
+            )
+            loader = DataLoader(dataset, batch_size=batch_size, shuffle=True, num_workers=0)
             
             # Training loop
             optimizer = torch.optim.Adam(self.model.parameters(), lr=0.001)
             criterion = nn.MSELoss()
             
             self.model.train()
-            for epoch in range(100):
-                optimizer.zero_grad()
-                pred = self.model(X_tensor)
-                loss = criterion(pred, y_tensor)
-                loss.backward()
-                optimizer.step()
+            for epoch in range(epochs):
+                for X_batch, y_batch in loader:
+                    optimizer.zero_grad()
+                    # BF16 forward halves activation bandwidth; loss stays in FP32
+                    with torch.autocast("cpu", dtype=torch.bfloat16):
+                        pred = self.model(X_batch)
+                    loss = criterion(pred.float(), y_batch)
+                    loss.backward()
+                    optimizer.step()
+            
+            self._deploy = self.model.inference_network()
+            self._ort = self._build_ort_session()
         else:
             self.model.fit(X_scaled, y)
         
         self.is_trained = True
     
+    def _build_ort_session(self):
+        """Export the trained network to ONNX and load it into ONNX Runtime"""
+        if not ORT_AVAILABLE:
+            return None
+        
+        buffer = io.BytesIO()
+        torch.onnx.export(
+            self._deploy,
+            torch.zeros(1, self.input_dim),
+            buffer,
+            input_names=["x"],
+            output_names=["y"],
+            dynamic_axes={"x": {0: "N"}, "y": {0: "N"}},
+            opset_version=17,
+            dynamo=False
+        )
+        return ort.InferenceSession(buffer.getvalue(), providers=["CPUExecutionProvider"])
+    
     def predict(self, features: np.ndarray) -> float:
         """Predict short-term return"""
         if not self.is_trained:
             return 0.0
         
+        # Repeated ticks often carry an identical feature vector
+        key = (features.dtype.char, features.tobytes())
+        if key == self._last_key:
+            return self._last_pred
+        
+        pred = self._predict_one(features)
+        self._last_key = key
+        self._last_pred = pred
+        return pred
+    
+    def _predict_one(self, features: np.ndarray) -> float:
+        """Run the model on a single feature vector"""
         if features.ndim == 1:
             features = features.reshape(1, -1)
         
-        features_scaled = self.scaler.transform(features)
+        features_scaled = (features - self._mu) * self._inv_sigma
         
         if self.model_type == "nn":
-            self.model.eval()
+            if self._ort is not None:
+                return float(self._ort.run(None, {"x": features_scaled.astype(np.float32, copy=False)})[0][0, 0])
             with torch.no_grad():
-                pred = self.model(torch.FloatTensor(features_scaled))
+                pred = self._deploy(torch.FloatTensor(features_scaled))
                 return pred.item()
         else:
             return self.model.predict(features_scaled)[0]
@@ -100,12 +170,13 @@ class PredictorWrapper:
         if not self.is_trained:
             return np.zeros(len(features))
         
-        features_scaled = self.scaler.transform(features)
+        features_scaled = (features - self._mu) * self._inv_sigma
         
         if self.model_type == "nn":
-            self.model.eval()
+            if self._ort is not None:
+                return self._ort.run(None, {"x": features_scaled.astype(np.float32, copy=False)})[0].ravel()
             with torch.no_grad():
-                pred = self.model(torch.FloatTensor(features_scaled))
+                pred = self._deploy(torch.FloatTensor(features_scaled))
                 return pred.numpy().flatten()
         else:
             return self.model.predict(features_scaled)
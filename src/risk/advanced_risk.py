@@ -6,6 +6,53 @@ import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from scipy import stats
 from dataclasses import dataclass
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback when numba is not installed: run the plain Python function"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Lower-tail z-scores for the common confidence levels, computed once at import
+_Z_SCORES = {c: float(stats.norm.ppf(1 - c)) for c in (0.90, 0.95, 0.975, 0.99, 0.995)}
+
+
+def _z_score(confidence: float) -> float:
+    """z such that P(Z <= z) = 1 - confidence"""
+    z = _Z_SCORES.get(round(confidence, 4))
+    if z is None:
+        z = float(stats.norm.ppf(1 - confidence))
+    return z
+
+
+@njit(cache=True, fastmath=True)
+def _max_drawdown(returns: np.ndarray) -> float:
+    """Max drawdown of cumulative returns in a single pass (<= 0)"""
+    cumulative = 0.0
+    running_max = -np.inf
+    max_dd = 0.0
+    for r in returns:
+        cumulative += r
+        if cumulative > running_max:
+            running_max = cumulative
+        dd = cumulative - running_max
+        if dd < max_dd:
+            max_dd = dd
+    return max_dd
 
 
 @dataclass
@@ -61,7 +108,7 @@ class VaRCalculator:
             mean = np.mean(returns)
         std = np.std(returns)
         
-        z_score = stats.norm.ppf(1 - confidence)
+        z_score = _z_score(confidence)
         var = -(mean + z_score * std)
         
         return float(max(0, var))
@@ -71,16 +118,20 @@ class VaRCalculator:
         returns: np.ndarray,
         confidence: float = 0.95,
         n_simulations: int = 10000,
-        horizon: int = 1
+        horizon: int = 1,
+        seed: Optional[int] = None
     ) -> float:
         """
         Monte Carlo VaR: Simulate future returns
         
+        Uses antithetic draws (z, -z) to halve RNG work and reduce estimator variance.
+        
         Args:
             returns: Historical returns
             confidence: Confidence level
             n_simulations: Number of Monte Carlo simulations
             horizon: Time horizon (days)
+            seed: Optional RNG seed for reproducible simulations
         """
         if len(returns) == 0:
             return 0.0
@@ -88,16 +139,71 @@ class VaRCalculator:
         mean = np.mean(returns)
         std = np.std(returns)
         
-        # Simulate returns
-        simulated_returns = np.random.normal(
-            mean * horizon,
-            std * np.sqrt(horizon),
-            n_simulations
-        )
+        # Simulate returns with antithetic pairs
+        rng = np.random.default_rng(seed)
+        z = rng.standard_normal((n_simulations + 1) // 2)
+        z = np.concatenate((z, -z))[:n_simulations]
+        simulated_returns = mean * horizon + std * np.sqrt(horizon) * z
         
-        var = -np.percentile(simulated_returns, (1 - confidence) * 100)
+        # O(n) selection of the tail quantile instead of a full sort
+        k = min(int((1 - confidence) * n_simulations), n_simulations - 1)
+        var = -np.partition(simulated_returns, k)[k]
         return float(max(0, var))
     
+    @staticmethod
+    def rolling_historical_var(
+        returns: np.ndarray,
+        window: int,
+        confidence: float = 0.95
+    ) -> np.ndarray:
+        """
+        Historical VaR over every sliding window of `returns`
+        
+        Uses an O(w) partial sort per window instead of a full sort, with the
+        same linear interpolation as np.percentile.
+        
+        Returns:
+            Array of length len(returns) - window + 1 (empty if too short)
+        """
+        returns = np.asarray(returns, dtype=np.float64)
+        if window <= 0 or len(returns) < window:
+            return np.empty(0)
+        
+        view = sliding_window_view(returns, window)
+        h = (window - 1) * (1 - confidence)
+        lo = int(np.floor(h))
+        hi = min(lo + 1, window - 1)
+        part = np.partition(view, [lo, hi], axis=1)
+        q = part[:, lo] + (h - lo) * (part[:, hi] - part[:, lo])
+        return -q
+    
+    @staticmethod
+    def rolling_parametric_var(
+        returns: np.ndarray,
+        window: int,
+        confidence: float = 0.95
+    ) -> np.ndarray:
+        """
+        Parametric VaR over every sliding window of `returns`
+        
+        Returns:
+            Array of length len(returns) - window + 1 (empty if too short)
+        """
+        returns = np.asarray(returns, dtype=np.float64)
+        if window <= 0 or len(returns) < window:
+            return np.empty(0)
+        
+        if BOTTLENECK_AVAILABLE:
+            mean = bn.move_mean(returns, window)[window - 1:]
+            std = bn.move_std(returns, window)[window - 1:]
+        else:
+            view = sliding_window_view(returns, window)
+            mean = view.mean(axis=1)
+            std = view.std(axis=1)
+        
+        z_score = _z_score(confidence)
+        return np.maximum(0.0, -(mean + z_score * std))
+    
     @staticmethod
     def calculate_all_methods(returns: np.ndarray, confidence: float = 0.95) -> Dict:
         """Calculate VaR using all methods"""
@@ -124,13 +230,9 @@ class CVaRCalculator:
         if len(returns) == 0:
             return 0.0
         
-        var = VaRCalculator.historical_var(returns, confidence)
-        
-        # Returns below VaR threshold
-        tail_returns = returns[returns <= -var]
-        
-        if len(tail_returns) == 0:
-            return float(var)
+        # The k worst returns, selected in O(n) without a full sort
+        k = max(1, int((1 - confidence) * len(returns)))
+        tail_returns = np.partition(returns, k - 1)[:k]
         
         cvar = -np.mean(tail_returns)
         return float(max(0, cvar))
@@ -202,20 +304,43 @@ class AdvancedRiskManager:
     
     def __init__(self, lookback_window: int = 252):  # 1 year of trading days
         self.lookback_window = lookback_window
-        self.returns_history: List[float] = []
+        
+        # Ring buffer of the most recent returns
+        self._buf = np.empty(lookback_window, dtype=np.float64)
+        self._head = 0
+        self._n = 0
+    
+    @property
+    def returns_history(self) -> Tuple[float, ...]:
+        """Returns in the lookback window, oldest first (use add_return to append)"""
+        return tuple(self._returns().tolist())
+    
+    @returns_history.setter
+    def returns_history(self, returns: List[float]):
+        """Replace the history, keeping the most recent lookback_window returns"""
+        self._head = 0
+        self._n = 0
+        for return_value in returns[-self.lookback_window:]:
+            self.add_return(return_value)
+    
+    def _returns(self) -> np.ndarray:
+        """Ordered view of the ring buffer, oldest first"""
+        if self._n < self.lookback_window:
+            return self._buf[:self._n]
+        return np.concatenate((self._buf[self._head:], self._buf[:self._head]))
     
     def add_return(self, return_value: float):
         """Add a return observation"""
-        self.returns_history.append(return_value)
-        if len(self.returns_history) > self.lookback_window:
-            self.returns_history.pop(0)
+        self._buf[self._head] = return_value
+        self._head = (self._head + 1) % self.lookback_window
+        self._n = min(self._n + 1, self.lookback_window)
     
     def calculate_risk_metrics(self) -> RiskMetrics:
         """Calculate comprehensive risk metrics"""
-        if len(self.returns_history) < 2:
+        if self._n < 2:
             return RiskMetrics(0, 0, 0, 0, 0, 0, 0)
         
-        returns = np.array(self.returns_history)
+        returns = self._returns()
         
         # VaR
         var_95 = VaRCalculator.historical_var(returns, 0.95)
@@ -229,10 +354,7 @@ class AdvancedRiskManager:
         volatility = float(np.std(returns))
         
         # Max drawdown
-        cumulative = np.cumsum(returns)
-        running_max = np.maximum.accumulate(cumulative)
-        drawdown = cumulative - running_max
-        max_drawdown = float(np.min(drawdown))
+        max_drawdown = float(_max_drawdown(returns))
         
         # Sharpe ratio (annualized, assuming daily returns)
         mean_return = np.mean(returns)
@@ -248,6 +370,19 @@ class AdvancedRiskManager:
             sharpe_ratio=float(sharpe)
         )
     
+    def calculate_rolling_var(
+        self,
+        window: int = 20,
+        confidence: float = 0.95,
+        method: str = "historical"
+    ) -> np.ndarray:
+        """Calculate VaR over each sliding window of the returns history"""
+        returns = self._returns()
+        
+        if method == "parametric":
+            return VaRCalculator.rolling_parametric_var(returns, window, confidence)
+        return VaRCalculator.rolling_historical_var(returns, window, confidence)
+    
     def stress_test(self, positions: Dict[str, float], scenarios: List[Dict[str, float]]) -> Dict:
         """Run stress tests on portfolio"""
         results = {}
@@ -3,9 +3,13 @@ Risk Attribution: Decompose portfolio risk by factor
 """
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
 from dataclasses import dataclass
 
+# Above this many assets, the loading matrix is stored in float32
+FLOAT32_MIN_ASSETS = 128
+
 
 @dataclass
 class RiskAttribution:
@@ -24,16 +28,52 @@ class RiskAttributionAnalyzer:
     def __init__(self):
         self.factors: List[str] = []
         self.assets: List[str] = []
-        self.factor_loadings: Dict[str, Dict[str, float]] = {}  # asset -> {factor -> loading}
+        self._factor_loadings: Dict[str, Mapping[str, float]] = {}  # asset -> {factor -> loading}
         self.factor_covariance: np.ndarray = None
+        
+        # Dense factor loading matrix B (assets x factors), kept in sync with factor_loadings
+        self._B: np.ndarray = np.zeros((0, 0))
+        self._asset_idx: Dict[str, int] = {}
+        self._factor_idx: Dict[str, int] = {}
+        self._asset_cov: Optional[np.ndarray] = None  # cached B @ Cov(factors) @ B'
+    
+    @property
+    def factor_loadings(self) -> Mapping[str, Mapping[str, float]]:
+        """Read-only view of asset -> {factor -> loading} (update via set_factor_loadings)"""
+        return MappingProxyType(self._factor_loadings)
+    
+    def _rebuild_loading_matrix(self):
+        """Rebuild B from factor_loadings after the asset or factor universe changes"""
+        self._asset_idx = {asset: i for i, asset in enumerate(self.assets)}
+        self._factor_idx = {factor: j for j, factor in enumerate(self.factors)}
+        # Large universes store loadings in float32 to halve bandwidth in the BLAS calls
+        dtype = np.float32 if len(self.assets) >= FLOAT32_MIN_ASSETS else np.float64
+        self._B = np.zeros((len(self.assets), len(self.factors)), dtype=dtype)
+        for asset, loadings in self._factor_loadings.items():
+            self._write_loadings(asset, loadings)
+        self._asset_cov = None
+    
+    def _write_loadings(self, asset: str, loadings: Mapping[str, float]):
+        """Write one asset's loadings into its row of B"""
+        i = self._asset_idx.get(asset)
+        if i is None:
+            return
+        row = self._B[i]
+        row[:] = 0.0
+        for factor, loading in loadings.items():
+            j = self._factor_idx.get(factor)
+            if j is not None:
+                row[j] = loading
     
     def set_factors(self, factors: List[str]):
         """Set factor names"""
         self.factors = factors
+        self._rebuild_loading_matrix()
     
     def set_assets(self, assets: List[str]):
         """Set asset names"""
         self.assets = assets
+        self._rebuild_loading_matrix()
     
     def set_factor_loadings(
         self,
@@ -41,11 +81,14 @@ class RiskAttributionAnalyzer:
         loadings: Dict[str, float]
     ):
         """Set factor loadings for an asset"""
-        self.factor_loadings[asset] = loadings
+        self._factor_loadings[asset] = MappingProxyType(dict(loadings))
+        self._write_loadings(asset, loadings)
+        self._asset_cov = None
     
     def set_factor_covariance(self, covariance_matrix: np.ndarray):
         """Set factor covariance matrix"""
         self.factor_covariance = covariance_matrix
+        self._asset_cov = None
     
     def calculate_asset_covariance(
         self,
@@ -57,21 +100,16 @@ class RiskAttributionAnalyzer:
         Cov(assets) = B * Cov(factors) * B'
         where B is factor loading matrix
         """
-        n_assets = len(self.assets)
-        asset_cov = np.zeros((n_assets, n_assets))
-        
-        # Build factor loading matrix
-        B = np.zeros((n_assets, len(self.factors)))
-        for i, asset in enumerate(self.assets):
-            if asset in self.factor_loadings:
-                for j, factor in enumerate(self.factors):
-                    B[i, j] = self.factor_loadings[asset].get(factor, 0.0)
+        if self.factor_covariance is None:
+            n_assets = len(self.assets)
+            return np.zeros((n_assets, n_assets))
         
-        # Calculate asset covariance
-        if self.factor_covariance is not None:
-            asset_cov = B @ self.factor_covariance @ B.T
+        if self._asset_cov is None:
+            factor_cov = self.factor_covariance.astype(self._B.dtype, copy=False)
+            self._asset_cov = (self._B @ factor_cov) @ self._B.T
         
-        return asset_cov
+        # Always a float64 copy, so callers cannot corrupt the cache
+        return self._asset_cov.astype(np.float64)
     
     def attribute_risk(
         self,
@@ -81,49 +119,47 @@ class RiskAttributionAnalyzer:
         """
         Attribute portfolio risk to factors and assets
         """
-        # Get asset covariance
-        if asset_covariance is None:
-            asset_covariance = self.calculate_asset_covariance(weights)
-        
         # Portfolio weights vector
         w = np.array([weights.get(asset, 0.0) for asset in self.assets])
         
-        # Portfolio variance
-        portfolio_variance = w.T @ asset_covariance @ w
+        # Factor exposures
+        factor_exposures = None
+        if self.factor_covariance is not None:
+            factor_exposures = (self._B.T @ w.astype(self._B.dtype)).astype(np.float64)
+        
+        # Portfolio variance and marginal contributions (covariance @ weights)
+        if asset_covariance is not None:
+            marginal = asset_covariance @ w
+            portfolio_variance = w @ marginal
+        elif factor_exposures is not None:
+            # Factor form: w' B Sf B' w without building the n x n asset covariance
+            factor_marginal = self.factor_covariance @ factor_exposures
+            portfolio_variance = factor_exposures @ factor_marginal
+            marginal = (self._B @ factor_marginal.astype(self._B.dtype)).astype(np.float64)
+        else:
+            marginal = np.zeros(len(self.assets))
+            portfolio_variance = 0.0
         total_risk = np.sqrt(portfolio_variance)
         
         # Factor contributions
         factor_contributions = {}
-        if self.factor_covariance is not None:
-            # Build factor loading matrix
-            B = np.zeros((len(self.assets), len(self.factors)))
-            for i, asset in enumerate(self.assets):
-                if asset in self.factor_loadings:
-                    for j, factor in enumerate(self.factors):
-                        B[i, j] = self.factor_loadings[asset].get(factor, 0.0)
-            
-            # Factor exposures
-            factor_exposures = B.T @ w
-            
-            # Factor contributions to variance
+        if factor_exposures is not None:
+            # Contribution = exposure * (factor variance * exposure)
+            factor_vars = factor_exposures ** 2 * np.diag(self.factor_covariance)
             for i, factor in enumerate(self.factors):
-                # Contribution = exposure * (factor variance * exposure)
-                factor_var = self.factor_covariance[i, i]
-                factor_contributions[factor] = float(factor_exposures[i]**2 * factor_var)
+                factor_contributions[factor] = float(factor_vars[i])
         
-        # Asset contributions
-        asset_contributions = {}
-        for i, asset in enumerate(self.assets):
-            # Marginal contribution = weight * (covariance @ weights)[i]
-            marginal = (asset_covariance @ w)[i]
-            contribution = w[i] * marginal
-            asset_contributions[asset] = float(contribution)
+        # Asset contributions: weight * (covariance @ weights)[i]
+        asset_contrib = w * marginal
+        asset_contributions = {
+            asset: float(asset_contrib[i]) for i, asset in enumerate(self.assets)
+        }
         
         return RiskAttribution(
             total_risk=float(total_risk),
             factor_contributions=factor_contributions,
             asset_contributions=asset_contributions,
-            factor_loadings=self.factor_loadings.copy()
+            factor_loadings={asset: dict(loadings) for asset, loadings in self._factor_loadings.items()}
         )
     
     def calculate_var_attribution(
@@ -146,16 +182,18 @@ class RiskAttributionAnalyzer:
         portfolio_var = -np.percentile(portfolio_returns, (1 - confidence) * 100)
         
         # Component VaR (contribution of each asset)
-        component_var = {}
-        for i, asset in enumerate(self.assets):
-            # Marginal VaR contribution
-            asset_returns_i = asset_returns[:, i]
-            correlation = np.corrcoef(portfolio_returns, asset_returns_i)[0, 1]
-            asset_std = np.std(asset_returns_i)
-            portfolio_std = np.std(portfolio_returns)
-            
-            marginal_var = correlation * asset_std / portfolio_std * portfolio_var
-            component_var[asset] = float(w[i] * marginal_var)
+        # Covariance of every asset with the portfolio in one matrix-vector product
+        asset_centered = asset_returns - asset_returns.mean(axis=0)
+        portfolio_centered = portfolio_returns - portfolio_returns.mean()
+        cov_row = asset_centered.T @ portfolio_centered / len(portfolio_returns)
+        asset_std = asset_returns.std(axis=0)
+        portfolio_std = portfolio_returns.std()
+        
+        # Marginal VaR contribution
+        correlation = cov_row / (asset_std * portfolio_std)
+        marginal_var = correlation * asset_std / portfolio_std * portfolio_var
+        component = w * marginal_var
+        component_var = {asset: float(component[i]) for i, asset in enumerate(self.assets)}
         
         return {
             "portfolio_var": float(portfolio_var),
@@ -1,7 +1,8 @@
 """
 Risk Manager: Position limits, P&L stops, order rate limits
 """
-from typing import Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple, Union
 from dataclasses import dataclass, field
 import time
 
@@ -24,7 +25,8 @@ class ClientRiskState:
     unrealized_pnl: float = 0.0
     daily_pnl: float = 0.0
     order_count: int = 0
-    last_order_time: float = 0.0
+    last_order_time: int = 0  # monotonic ns of the last token refill
+    tokens: int = 0  # order-rate tokens available
     is_blocked: bool = False
 
 
@@ -35,35 +37,61 @@ class RiskManager:
     
     def __init__(self, limits: Optional[RiskLimits] = None):
         self.limits = limits or RiskLimits()
-        self.client_states: Dict[str, ClientRiskState] = {}
+        # Client states indexed by an integer handle assigned on first sight
+        self._id_map: Dict[str, int] = {}
+        self._states: List[ClientRiskState] = []
         self.session_start_time = time.time()
     
-    def get_or_create_state(self, client_id: str) -> ClientRiskState:
-        """Get or create risk state for client"""
-        if client_id not in self.client_states:
-            self.client_states[client_id] = ClientRiskState()
-        return self.client_states[client_id]
+    @property
+    def client_states(self) -> Mapping[str, ClientRiskState]:
+        """Read-only view of risk state by client id (register_client adds clients)"""
+        return MappingProxyType({client_id: self._states[h] for client_id, h in self._id_map.items()})
+    
+    def register_client(self, client_id: str) -> int:
+        """Return the integer handle for a client, creating its state if new"""
+        handle = self._id_map.get(client_id)
+        if handle is None:
+            handle = len(self._states)
+            self._id_map[client_id] = handle
+            self._states.append(ClientRiskState())
+        return handle
+    
+    def get_or_create_state(self, client: Union[str, int]) -> ClientRiskState:
+        """Get or create risk state for a client id or handle"""
+        if isinstance(client, int):
+            return self._states[client]
+        return self._states[self.register_client(client)]
     
     def check_order_rate(self, client_id: str) -> Tuple[bool, Optional[str]]:
-        """Check if client exceeds order rate limit"""
-        state = self.get_or_create_state(client_id)
-        now = time.time()
-        
-        # Reset counter if more than 1 second has passed
-        if now - state.last_order_time >= 1.0:
-            state.order_count = 0
-        
-        if state.order_count >= self.limits.max_order_rate:
+        """Check if client exceeds order rate limit (token bucket, integer ns)"""
+        return self._check_order_rate(self.get_or_create_state(client_id))
+    
+    def _check_order_rate(self, state: ClientRiskState) -> Tuple[bool, Optional[str]]:
+        max_rate = self.limits.max_order_rate
+        now_ns = time.monotonic_ns()
+        
+        # Refill whole tokens earned since the last refill
+        refill = (now_ns - state.last_order_time) * max_rate // 1_000_000_000
+        if refill > 0:
+            state.tokens = min(max_rate, state.tokens + refill)
+            if state.tokens == max_rate:
+                state.last_order_time = now_ns
+            else:
+                # Carry the fractional token over to the next call
+                state.last_order_time += refill * 1_000_000_000 // max_rate
+        
+        if state.tokens == 0:
             return False, "Order rate limit exceeded"
         
+        state.tokens -= 1
         state.order_count += 1
-        state.last_order_time = now
         return True, None
     
     def check_position_limit(self, client_id: str, side: str, size: int) -> Tuple[bool, Optional[str]]:
         """Check if order would exceed position limit"""
-        state = self.get_or_create_state(client_id)
-        
+        return self._check_position_limit(self.get_or_create_state(client_id), side, size)
+    
+    def _check_position_limit(self, state: ClientRiskState, side: str, size: int) -> Tuple[bool, Optional[str]]:
         # Calculate new position
         position_delta = size if side == "buy" else -size
         new_position = state.position + position_delta
@@ -94,8 +122,9 @@ class RiskManager:
     
     def check_daily_loss(self, client_id: str) -> Tuple[bool, Optional[str]]:
         """Check if client has exceeded daily loss limit"""
-        state = self.get_or_create_state(client_id)
-        
+        return self._check_daily_loss(self.get_or_create_state(client_id))
+    
+    def _check_daily_loss(self, state: ClientRiskState) -> Tuple[bool, Optional[str]]:
         total_pnl = state.realized_pnl + state.unrealized_pnl
         if total_pnl < -self.limits.max_daily_loss:
             state.is_blocked = True
@@ -105,7 +134,7 @@ class RiskManager:
     
     def validate_order(
         self,
-        client_id: str,
+        client_id: Union[str, int],
         side: str,
         size: int,
         price: Optional[float] = None,
@@ -113,44 +142,51 @@ class RiskManager:
     ) -> Tuple[bool, Optional[str]]:
         """
         Comprehensive order validation
+        
+        client_id may be the id string or the handle from register_client.
         Returns (is_valid, error_message)
         """
+        limits = self.limits
         state = self.get_or_create_state(client_id)
         
         # Check if blocked
         if state.is_blocked:
             return False, "Client is blocked due to risk violation"
         
-        # Check order rate
-        valid, msg = self.check_order_rate(client_id)
-        if not valid:
-            return False, msg
+        # Pure-arithmetic checks first so rejects never touch the clock
         
         # Check order size
-        valid, msg = self.check_order_size(size)
-        if not valid:
-            return False, msg
+        if size > limits.max_order_size:
+            return False, f"Order size {size} exceeds limit {limits.max_order_size}"
+        if size <= 0:
+            return False, "Order size must be positive"
         
         # Check position limit
-        valid, msg = self.check_position_limit(client_id, side, size)
-        if not valid:
-            return False, msg
+        new_position = state.position + (size if side == "buy" else -size)
+        if abs(new_position) > limits.max_position:
+            return False, f"Position limit exceeded: {new_position} > {limits.max_position}"
         
         # Check price bounds (for limit orders)
         if price is not None and mid_price is not None:
-            valid, msg = self.check_price_bounds(price, mid_price)
-            if not valid:
-                return False, msg
+            deviation = abs(price - mid_price) / mid_price
+            if deviation > limits.price_deviation_pct:
+                return False, f"Price deviation {deviation:.2%} exceeds limit {limits.price_deviation_pct:.2%}"
         
-        # Check daily loss
-        valid, msg = self.check_daily_loss(client_id)
+        # Check order rate (consumes a token only for otherwise-valid orders)
+        valid, msg = self._check_order_rate(state)
         if not valid:
             return False, msg
         
+        # Check daily loss
+        total_pnl = state.realized_pnl + state.unrealized_pnl
+        if total_pnl < -limits.max_daily_loss:
+            state.is_blocked = True
+            return False, f"Daily loss limit exceeded: {total_pnl:.2f}"
+        
         return True, None
     
-    def update_position(self, client_id: str, side: str, size: int, price: float):
-        """Update position after fill"""
+    def update_position(self, client_id: Union[str, int], side: str, size: int, price: float):
+        """Update position after fill (client id or register_client handle)"""
         state = self.get_or_create_state(client_id)
         position_delta = size if side == "buy" else -size
         state.position += position_delta
@@ -164,11 +200,12 @@ class RiskManager:
     
     def get_client_state(self, client_id: str) -> Optional[ClientRiskState]:
         """Get risk state for client"""
-        return self.client_states.get(client_id)
+        handle = self._id_map.get(client_id)
+        return self._states[handle] if handle is not None else None
     
     def reset_daily(self):
         """Reset daily counters (call at start of trading day)"""
-        for state in self.client_states.values():
+        for state in self._states:
             state.daily_pnl = 0.0
             state.order_count = 0
             state.is_blocked = False
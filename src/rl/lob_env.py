@@ -6,6 +6,7 @@ from gymnasium import spaces
 import numpy as np
 from typing import Dict, Tuple, Optional
 import time
+from itertools import chain
 
 from ..lob.order_book import LimitOrderBook, Order
 from ..features.microstructure import MicrostructureFeatureExtractor
@@ -19,6 +20,11 @@ class LOBMarketMakingEnv(gym.Env):
     
     metadata = {"render_modes": ["human"], "render_fps": 4}
     
+    # Synthetic liquidity seeded on reset
+    N_SEED_LEVELS = 5
+    _SEED_BID_IDS = tuple(f"init_bid_{i}" for i in range(N_SEED_LEVELS))
+    _SEED_ASK_IDS = tuple(f"init_ask_{i}" for i in range(N_SEED_LEVELS))
+    
     def __init__(
         self,
         episode_length: int = 1000,
@@ -32,6 +38,7 @@ class LOBMarketMakingEnv(gym.Env):
         self.episode_length = episode_length
         self.initial_mid = initial_mid
         self.tick_size = tick_size
+        self._ticks_per_unit = round(1 / tick_size)
         self.use_predictor = use_predictor
         self.predictor = predictor
         
@@ -39,9 +46,14 @@ class LOBMarketMakingEnv(gym.Env):
         self.lob = LimitOrderBook(tick_size=tick_size)
         self.feature_extractor = MicrostructureFeatureExtractor()
         
+        # The agent's resting quotes (at most one per side)
+        self._active_bid: Optional[Order] = None
+        self._active_ask: Optional[Order] = None
+        
         # State: [mid, inventory, spread, depth_imbalance, ofi, predictor_score, ...]
         # Observation space
-        obs_dim = 12 + (1 if use_predictor else 0)  # features + optional predictor
+        n_features = len(self.feature_extractor.FEATURE_ORDER)
+        obs_dim = n_features + 1 + (1 if use_predictor else 0)  # features + inventory + optional predictor
         self.observation_space = spaces.Box(
             low=-np.inf,
             high=np.inf,
@@ -49,6 +61,9 @@ class LOBMarketMakingEnv(gym.Env):
             dtype=np.float32
         )
         
+        # Observation buffer reused across steps
+        self._obs_buf = np.empty(obs_dim, dtype=np.float32)
+        
         # Action space: [bid_offset, ask_offset, quote_size]
         # Offsets are in ticks (multiples of tick_size)
         self.action_space = spaces.Box(
@@ -64,41 +79,24 @@ class LOBMarketMakingEnv(gym.Env):
         """Reset environment"""
         super().reset(seed=seed)
         
-        # Reset LOB
-        self.lob = LimitOrderBook(tick_size=self.tick_size)
+        # Reset LOB (cleared in place; reset runs once per episode)
+        self.lob.clear()
         
-        # Initialize with some synthetic orders
+        # Initialize with some synthetic orders (5 levels each side, cannot cross)
         mid = self.initial_mid
-        for i in range(5):
-            bid_price = round(mid - (i + 1) * self.tick_size, 2)
-            ask_price = round(mid + (i + 1) * self.tick_size, 2)
-            
-            # Add synthetic orders
-            bid_order = Order(
-                order_id=f"init_bid_{i}",
-                client_id="SYNTHETIC",
-                side="buy",
-                type="limit",
-                price=bid_price,
-                size=10
-            )
-            ask_order = Order(
-                order_id=f"init_ask_{i}",
-                client_id="SYNTHETIC",
-                side="sell",
-                type="limit",
-                price=ask_price,
-                size=10
-            )
-            self.lob.add_order(bid_order)
-            self.lob.add_order(ask_order)
+        offsets = np.arange(1, self.N_SEED_LEVELS + 1) * self.tick_size
+        seed_sizes = (10,) * self.N_SEED_LEVELS
+        self.lob.add_orders_bulk("buy", np.round(mid - offsets, 2), seed_sizes, "SYNTHETIC", self._SEED_BID_IDS)
+        self.lob.add_orders_bulk("sell", np.round(mid + offsets, 2), seed_sizes, "SYNTHETIC", self._SEED_ASK_IDS)
         
         # Agent state
         self.inventory = 0
         self.cash = 0.0
         self.realized_pnl = 0.0
-        self.active_orders = {}
+        self._active_bid = None
+        self._active_ask = None
         self.t = 0
+        self._draw_market_events()
         
         # Get initial observation
         obs = self._get_observation()
@@ -107,43 +105,54 @@ class LOBMarketMakingEnv(gym.Env):
         return obs, info
     
     def _get_observation(self) -> np.ndarray:
-        """Get current observation"""
-        # Get book snapshot
-        snapshot = self.lob.get_book_snapshot()
-        bids = snapshot["bids"]
-        asks = snapshot["asks"]
+        """
+        Get current observation
+        
+        Features are assembled in a preallocated buffer; a copy is returned
+        because gymnasium requires fresh observation data on every call.
+        Also caches the book's mid in self._mid: the book does not change
+        again until the next step, so reward and the next quotes reuse it.
+        """
+        # Get book depth
+        bids = self.lob.get_depth("buy", 10)
+        asks = self.lob.get_depth("sell", 10)
+        if bids and asks:
+            self._mid = (bids[0][0] + asks[0][0]) / 2.0
+        else:
+            self._mid = self.lob.last_trade_price or self.initial_mid
         
         # Extract features
+        n_features = len(self.feature_extractor.FEATURE_ORDER)
         features = self.feature_extractor.extract_features(bids, asks)
-        feature_vec = self.feature_extractor.get_feature_vector(features)
+        feature_vec = self.feature_extractor.get_feature_vector(features, out=self._obs_buf[:n_features])
         
-        # Add inventory (normalized)
-        inventory_norm = self.inventory / 50.0  # Normalize by max inventory
-        
-        # Combine features
-        obs_list = list(feature_vec) + [inventory_norm]
+        # Add inventory (normalized by max inventory)
+        self._obs_buf[n_features] = self.inventory * (1.0 / 50.0)
         
         # Add predictor score if available
         if self.use_predictor and self.predictor is not None:
-            predictor_score = self.predictor.predict(feature_vec.reshape(1, -1))
-            obs_list.append(predictor_score)
+            self._obs_buf[n_features + 1] = self.predictor.predict(feature_vec.reshape(1, -1))
+        elif self.use_predictor:
+            self._obs_buf[n_features + 1] = 0.0
         
-        return np.array(obs_list, dtype=np.float32)
+        return self._obs_buf.copy()
     
     def step(self, action: np.ndarray) -> Tuple[np.ndarray, float, bool, bool, Dict]:
         """Execute one step"""
         bid_offset, ask_offset, quote_size = action
         
-        # Convert offsets to prices
-        mid = self.lob.mid_price() or self.initial_mid
-        bid_price = round(mid - bid_offset * self.tick_size, 2)
-        ask_price = round(mid + ask_offset * self.tick_size, 2)
+        # Convert offsets (in ticks) to prices via integer tick counts
+        mid = self._mid
+        mid_ticks = mid * self._ticks_per_unit
+        bid_price = int(mid_ticks - bid_offset + 0.5) / self._ticks_per_unit
+        ask_price = int(mid_ticks + ask_offset + 0.5) / self._ticks_per_unit
         quote_size = int(max(1, min(10, quote_size)))
         
         # Cancel old orders
-        for order_id in list(self.active_orders.keys()):
-            self.lob.cancel_order(order_id)
-        self.active_orders.clear()
+        if self._active_bid is not None:
+            self.lob.cancel_order(self._active_bid.order_id)
+        if self._active_ask is not None:
+            self.lob.cancel_order(self._active_ask.order_id)
         
         # Place new quotes
         bid_order = Order(
@@ -168,33 +177,28 @@ class LOBMarketMakingEnv(gym.Env):
         fills_ask = self.lob.add_order(ask_order)
         
         # Track active orders
-        if bid_order.status == "active":
-            self.active_orders[bid_order.order_id] = bid_order
-        if ask_order.status == "active":
-            self.active_orders[ask_order.order_id] = ask_order
+        self._active_bid = bid_order if bid_order.status == "active" else None
+        self._active_ask = ask_order if ask_order.status == "active" else None
         
         # Process fills and update inventory/P&L
-        for fill in fills_bid + fills_ask:
+        for fill in chain(fills_bid, fills_ask):
             if fill.client_id == "RL_AGENT":
-                if fill.side == "buy":
-                    self.inventory += fill.size
-                    self.cash -= fill.price * fill.size
-                else:
-                    self.inventory -= fill.size
-                    self.cash += fill.price * fill.size
+                signed_size = fill.size * fill.side_sign
+                self.inventory += signed_size
+                self.cash -= fill.price * signed_size
         
         # Generate market event (synthetic order flow)
         self._generate_market_event()
         
-        # Compute reward
-        reward = self._compute_reward()
-        
         # Update time
         self.t += 1
         done = self.t >= self.episode_length
         
-        # Get next observation
+        # Get next observation (refreshes self._mid from the post-event book)
         obs = self._get_observation()
+        
+        # Compute reward
+        reward = self._compute_reward(self._mid)
         info = {
             "inventory": self.inventory,
             "pnl": self.realized_pnl,
@@ -204,43 +208,44 @@ class LOBMarketMakingEnv(gym.Env):
         
         return obs, reward, done, False, info
     
+    def _draw_market_events(self):
+        """Pre-draw the synthetic order flow for a whole episode"""
+        n = self.episode_length
+        rng = self.np_random
+        self._event_mask = rng.random(n) < 0.3  # 30% chance per step
+        self._event_buy = rng.random(n) < 0.5
+        self._event_size = rng.integers(1, 6, n)
+        self._event_nonce = rng.integers(0, 1001, n)
+    
     def _generate_market_event(self):
         """Generate synthetic market order to create realistic flow"""
-        import random
+        # Steps past episode_length reuse the episode's draws
+        t = self.t % self.episode_length
         
-        if random.random() < 0.3:  # 30% chance
-            mid = self.lob.mid_price() or self.initial_mid
-            side = "buy" if random.random() < 0.5 else "sell"
-            size = random.randint(1, 5)
-            
+        if self._event_mask[t]:
             market_order = Order(
-                order_id=f"market_{self.t}_{random.randint(0, 1000)}",
+                order_id=f"market_{self.t}_{self._event_nonce[t]}",
                 client_id="MARKET",
-                side=side,
+                side="buy" if self._event_buy[t] else "sell",
                 type="market",
-                size=size
+                size=int(self._event_size[t])
             )
             self.lob.add_order(market_order)
     
-    def _compute_reward(self) -> float:
+    def _compute_reward(self, mid: float) -> float:
         """
         Reward function for RL
         Combines spread capture, inventory penalty, and P&L
         """
-        # Spread capture (simplified - would need to track actual fills)
-        spread_reward = 0.0
-        
-        # Inventory penalty (quadratic)
-        inventory_penalty = -0.01 * (self.inventory ** 2)
-        
-        # P&L component (mark-to-market)
-        mid = self.lob.mid_price() or self.initial_mid
-        unrealized_pnl = self.inventory * (mid - self.initial_mid)
-        pnl_reward = 0.001 * unrealized_pnl
+        # Spread capture (simplified - would need to track actual fills): 0.0
+        inventory = self.inventory
         
-        total_reward = spread_reward + inventory_penalty + pnl_reward
+        # Inventory penalty (quadratic) + P&L component (mark-to-market)
+        # Kept in Python: a numba kernel's call dispatch costs more than this arithmetic
+        inventory_penalty = -0.01 * (inventory * inventory)
+        pnl_reward = 0.001 * (inventory * (mid - self.initial_mid))
         
-        return float(total_reward)
+        return float(inventory_penalty + pnl_reward)
     
     def render(self):
         """Render environment state"""
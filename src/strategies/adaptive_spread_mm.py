@@ -1,9 +1,8 @@
 """
 Adaptive Spread Market Maker: Adjusts spread based on volatility
 """
-from .base_strategy import BaseStrategy, Quote, MarketState
+from .base_strategy import BaseStrategy, Quote, MarketState, round_to_tick
 import numpy as np
-from collections import deque
 
 
 class AdaptiveSpreadMarketMaker(BaseStrategy):
@@ -31,19 +30,17 @@ class AdaptiveSpreadMarketMaker(BaseStrategy):
         # Volatility estimation
         self.ewma_vol = 0.0
         self.last_mid = None
-        self.returns_history = deque(maxlen=100)
     
     def _update_volatility(self, current_mid: float):
         """Update EWMA volatility estimate"""
         if self.last_mid is not None:
             ret = (current_mid - self.last_mid) / self.last_mid
-            self.returns_history.append(ret)
             
             # EWMA of squared returns
             if self.ewma_vol == 0.0:
-                self.ewma_vol = ret ** 2
+                self.ewma_vol = ret * ret
             else:
-                self.ewma_vol = self.vol_alpha * (ret ** 2) + (1 - self.vol_alpha) * self.ewma_vol
+                self.ewma_vol = self.vol_alpha * (ret * ret) + (1 - self.vol_alpha) * self.ewma_vol
         
         self.last_mid = current_mid
     
@@ -61,8 +58,8 @@ class AdaptiveSpreadMarketMaker(BaseStrategy):
         # Clamp spread
         half_spread = max(self.min_spread, min(half_spread, self.max_spread))
         
-        bid_price = round(mid - half_spread, 2)
-        ask_price = round(mid + half_spread, 2)
+        bid_price = round_to_tick(mid - half_spread)
+        ask_price = round_to_tick(mid + half_spread)
         
         return Quote(
             bid_price=bid_price,
@@ -5,9 +5,29 @@ from abc import ABC, abstractmethod
 from typing import Dict, Optional, List
 from dataclasses import dataclass
 import time
+import numpy as np
 
 
-@dataclass
+# Quote prices sit on a one-cent grid
+TICKS_PER_UNIT = 100
+
+
+def round_to_tick(price: float) -> float:
+    """
+    Round a (positive) price to the tick grid, halves up
+    
+    Unlike round(price, 2), which rounds the binary value and so goes either
+    way on half cents, a price exactly on a half cent always goes up a tick.
+    """
+    return int(price * TICKS_PER_UNIT + 0.5) / TICKS_PER_UNIT
+
+
+def round_to_tick_array(prices: np.ndarray) -> np.ndarray:
+    """round_to_tick over an array (same float ops, so results match exactly)"""
+    return np.floor(prices * TICKS_PER_UNIT + 0.5) / TICKS_PER_UNIT
+
+
+@dataclass(slots=True)
 class Quote:
     """Represents a bid/ask quote"""
     bid_price: float
@@ -16,9 +36,14 @@ class Quote:
     ask_size: int
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketState:
-    """Current market state snapshot"""
+    """
+    Current market state snapshot
+    
+    Live clients reuse one instance and overwrite its fields each tick, so
+    strategies must not hold on to it between compute_quotes calls.
+    """
     mid: float
     best_bid: Optional[float]
     best_ask: Optional[float]
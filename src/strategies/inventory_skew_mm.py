@@ -1,7 +1,7 @@
 """
 Inventory-Aware Market Maker: Skews quotes based on inventory
 """
-from .base_strategy import BaseStrategy, Quote, MarketState
+from .base_strategy import BaseStrategy, Quote, MarketState, round_to_tick
 import numpy as np
 
 
@@ -37,8 +37,8 @@ class InventorySkewMarketMaker(BaseStrategy):
         # and ask more aggressive (closer to mid) to encourage selling
         skew = normalized_inv * self.inventory_skew_factor
         
-        bid_price = round(mid - self.half_spread - skew, 2)
-        ask_price = round(mid + self.half_spread - skew, 2)
+        bid_price = round_to_tick(mid - self.half_spread - skew)
+        ask_price = round_to_tick(mid + self.half_spread - skew)
         
         return Quote(
             bid_price=bid_price,
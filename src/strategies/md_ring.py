@@ -0,0 +1,133 @@
+"""
+Market-data ring: top-of-book records in shared memory for co-located strategies
+"""
+import asyncio
+import math
+import struct
+import time
+from contextlib import asynccontextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Tuple
+
+# Header: number of records ever written (the next slot is count % capacity)
+HEADER = struct.Struct("=Q")
+# Record: timestamp, mid, best_bid, best_ask (NaN for a missing side)
+RECORD = struct.Struct("=dddd")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without letting this process's resource tracker unlink it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class MidRing:
+    """
+    Fixed-size ring of (timestamp, mid, best_bid, best_ask) records in a
+    SharedMemory block
+    
+    One process (a MarketDataHub) writes every snapshot; any number of
+    strategy processes attach by name and read the newest record without a
+    WebSocket or JSON parse of their own.
+    """
+    
+    def __init__(self, name: Optional[str] = None, capacity: int = 1024, create: bool = False):
+        """
+        Args:
+            name: Shared-memory block name (generated if creating without one)
+            capacity: Number of records (writer only; readers take it from the block size)
+            create: Create the block (writer) instead of attaching to it (reader)
+        """
+        if create:
+            size = HEADER.size + capacity * RECORD.size
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            HEADER.pack_into(self.shm.buf, 0, 0)
+        else:
+            self.shm = _attach(name)
+        self.name = self.shm.name
+        self.capacity = (self.shm.size - HEADER.size) // RECORD.size
+    
+    @property
+    def count(self) -> int:
+        """Number of records written so far"""
+        return HEADER.unpack_from(self.shm.buf, 0)[0]
+    
+    def write(self, timestamp: float, mid: float, best_bid: Optional[float], best_ask: Optional[float]):
+        """Append a record (single writer only)"""
+        count = self.count
+        offset = HEADER.size + (count % self.capacity) * RECORD.size
+        RECORD.pack_into(
+            self.shm.buf, offset,
+            timestamp,
+            math.nan if mid is None else mid,
+            math.nan if best_bid is None else best_bid,
+            math.nan if best_ask is None else best_ask
+        )
+        # Publish the record only after it is fully written
+        HEADER.pack_into(self.shm.buf, 0, count + 1)
+    
+    def latest(self) -> Optional[Tuple[int, float, float, float, float]]:
+        """Return (count, timestamp, mid, best_bid, best_ask) of the newest record, or None"""
+        buf = self.shm.buf
+        while True:
+            count = HEADER.unpack_from(buf, 0)[0]
+            if count == 0:
+                return None
+            record = RECORD.unpack_from(buf, HEADER.size + ((count - 1) % self.capacity) * RECORD.size)
+            # Retry if the writer lapped the ring and reused this slot mid-read
+            if HEADER.unpack_from(buf, 0)[0] - count < self.capacity - 1:
+                return (count,) + record
+    
+    @asynccontextmanager
+    async def subscribe(self, poll_interval: float = 0.001, max_age: Optional[float] = None):
+        """
+        Yield an async-iterable of snapshot dicts (same keys as the md feed's
+        top of book), polling the ring every poll_interval seconds
+        
+        Only records written after subscribing are yielded; with max_age,
+        records whose timestamp is older than that many seconds are skipped.
+        """
+        yield _RingStream(self, poll_interval, max_age)
+    
+    def close(self):
+        """Detach from the block"""
+        self.shm.close()
+    
+    def unlink(self):
+        """Destroy the block (writer, once every reader is done)"""
+        self.shm.unlink()
+
+
+class _RingStream:
+    """Async iterator over new MidRing records (mirrors websockets' async for)"""
+    
+    def __init__(self, ring: MidRing, poll_interval: float, max_age: Optional[float]):
+        self.ring = ring
+        self.poll_interval = poll_interval
+        self.max_age = max_age
+        self.last_count = ring.count  # the record already there may be stale
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> dict:
+        while True:
+            record = self.ring.latest()
+            if record is not None and record[0] != self.last_count:
+                self.last_count, timestamp, mid, best_bid, best_ask = record
+                if self.max_age is None or time.time() - timestamp <= self.max_age:
+                    break
+            await asyncio.sleep(self.poll_interval)
+        bid = None if math.isnan(best_bid) else best_bid
+        ask = None if math.isnan(best_ask) else best_ask
+        return {
+            "mid": None if math.isnan(mid) else mid,
+            "best_bid": bid,
+            "best_ask": ask,
+            "spread": ask - bid if bid is not None and ask is not None else None,
+            "timestamp": timestamp
+        }
@@ -1,9 +1,9 @@
 """
 Options Market-Making Strategy with Delta Hedging
 """
-from typing import Optional
+from typing import Dict, Optional
 from .base_strategy import BaseStrategy, Quote, MarketState
-from ..options.pricing import Option, BlackScholes
+from ..options.pricing import Option, BlackScholes, bs_call_put
 from ..options.delta_hedging import DeltaHedger
 
 
@@ -66,9 +66,10 @@ class OptionsMarketMaker(BaseStrategy):
         self.call_option.update_spot(spot)
         self.put_option.update_spot(spot)
         
-        # Get option prices
-        call_price = self.call_option.price()
-        put_price = self.put_option.price()
+        # Get option prices (one shared d1/d2 evaluation)
+        call_price, put_price = map(float, bs_call_put(
+            spot, self.strike, self.expiration_years, self.risk_free_rate, self.volatility
+        ))
         
         # Calculate bid/ask with target spread
         call_spread = call_price * self.target_spread_pct
@@ -1,16 +1,45 @@
 """
 RL-based Market Maker: Uses trained RL agent to make quoting decisions
 """
+import io
 import numpy as np
+import torch
+import torch.nn as nn
 from typing import Optional
 from stable_baselines3 import PPO
 from stable_baselines3.common.vec_env import DummyVecEnv
 
+try:
+    import onnxruntime as ort
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
+
 from .base_strategy import BaseStrategy, Quote, MarketState
 from ..rl.lob_env import LOBMarketMakingEnv
 from ..features.microstructure import MicrostructureFeatureExtractor
 
 
+class _DeterministicActor(nn.Module):
+    """
+    Actor path of an SB3 Gaussian policy: observation -> mean action,
+    clipped to the action space (what predict(deterministic=True) returns)
+    """
+    
+    def __init__(self, policy, low: np.ndarray, high: np.ndarray):
+        super().__init__()
+        self.features_extractor = policy.pi_features_extractor
+        self.mlp_extractor = policy.mlp_extractor
+        self.action_net = policy.action_net
+        self.register_buffer("low", torch.as_tensor(low, dtype=torch.float32))
+        self.register_buffer("high", torch.as_tensor(high, dtype=torch.float32))
+    
+    def forward(self, obs: torch.Tensor) -> torch.Tensor:
+        features = self.features_extractor(obs)
+        latent_pi = self.mlp_extractor.forward_actor(features)
+        return torch.clamp(self.action_net(latent_pi), self.low, self.high)
+
+
 class RLMarketMaker(BaseStrategy):
     """
     Market maker that uses a trained RL agent to decide quotes
@@ -26,6 +55,7 @@ class RLMarketMaker(BaseStrategy):
     ):
         super().__init__(client_id)
         self.tick_size = tick_size
+        self._ticks_per_unit = round(1 / tick_size)
         self.initial_mid = initial_mid
         self.use_predictor = use_predictor
         
@@ -47,12 +77,43 @@ class RLMarketMaker(BaseStrategy):
         # Feature extractor
         self.feature_extractor = MicrostructureFeatureExtractor()
         
+        # Preallocated policy input; _obs_np views the same memory
+        obs_dim = self.model.observation_space.shape[0]
+        self._obs_tensor = torch.zeros((1, obs_dim), dtype=torch.float32)
+        self._obs_np = self._obs_tensor.numpy()
+        self._actor = _DeterministicActor(
+            self.model.policy, self.model.action_space.low, self.model.action_space.high
+        ).eval()
+        self._ort = self._build_ort_session()
+        
         # Track last market state for feature extraction
         self.last_bids = []
         self.last_asks = []
     
+    def _build_ort_session(self):
+        """Export the deterministic actor to ONNX and load it into ONNX Runtime"""
+        if not ORT_AVAILABLE:
+            return None
+        
+        buffer = io.BytesIO()
+        torch.onnx.export(
+            self._actor,
+            self._obs_tensor,
+            buffer,
+            input_names=["obs"],
+            output_names=["action"],
+            opset_version=17,
+            dynamo=False
+        )
+        return ort.InferenceSession(buffer.getvalue(), providers=["CPUExecutionProvider"])
+    
     def _get_observation(self, market_state: MarketState) -> np.ndarray:
-        """Extract observation from market state"""
+        """
+        Extract observation from market state
+        
+        Written straight into the policy input buffer; the returned row is a
+        view of it and is overwritten on the next call.
+        """
         # Use last book snapshot if available, otherwise create synthetic
         if self.last_bids and self.last_asks:
             bids = self.last_bids
@@ -64,37 +125,42 @@ class RLMarketMaker(BaseStrategy):
             asks = [(mid + 0.01 * i, 10) for i in range(1, 6)]
         
         # Extract features
+        obs = self._obs_np[0]
+        n_features = len(self.feature_extractor.FEATURE_ORDER)
         features = self.feature_extractor.extract_features(bids, asks)
-        feature_vec = self.feature_extractor.get_feature_vector(features)
+        feature_vec = self.feature_extractor.get_feature_vector(features, out=obs[:n_features])
         
         # Add inventory (normalized)
-        inventory_norm = market_state.inventory / 50.0
-        
-        # Combine features
-        obs_list = list(feature_vec) + [inventory_norm]
+        obs[n_features] = market_state.inventory / 50.0
         
         # Add predictor score if available
-        if self.use_predictor and hasattr(self.env, 'predictor') and self.env.predictor:
-            predictor_score = self.env.predictor.predict(feature_vec.reshape(1, -1))
-            obs_list.append(predictor_score)
+        if self.use_predictor and self.env.predictor is not None:
+            obs[n_features + 1] = self.env.predictor.predict(feature_vec.reshape(1, -1))
+        elif self.use_predictor:
+            obs[n_features + 1] = 0.0
         
-        return np.array(obs_list, dtype=np.float32)
+        return obs
     
     def compute_quotes(self, market_state: MarketState) -> Quote:
         """Compute quotes using RL agent"""
-        # Get observation
-        obs = self._get_observation(market_state)
+        # Get observation (fills the policy input buffer)
+        self._get_observation(market_state)
         
         # Get action from RL agent
-        action, _ = self.model.predict(obs, deterministic=True)
+        # (bypasses model.predict; same as predict(obs, deterministic=True))
+        if self._ort is not None:
+            action = self._ort.run(None, {"obs": self._obs_np})[0][0]
+        else:
+            with torch.no_grad():
+                action = self._actor(self._obs_tensor)[0].numpy()
         
         # Action: [bid_offset, ask_offset, quote_size]
         bid_offset, ask_offset, quote_size = action
         
-        # Convert offsets to prices
-        mid = market_state.mid
-        bid_price = round(mid - bid_offset * self.tick_size, 2)
-        ask_price = round(mid + ask_offset * self.tick_size, 2)
+        # Convert offsets (in ticks) to prices via integer tick counts
+        mid_ticks = market_state.mid * self._ticks_per_unit
+        bid_price = int(mid_ticks - float(bid_offset) + 0.5) / self._ticks_per_unit
+        ask_price = int(mid_ticks + float(ask_offset) + 0.5) / self._ticks_per_unit
         quote_size = int(max(1, min(10, quote_size)))
         
         return Quote(
@@ -105,6 +171,11 @@ class RLMarketMaker(BaseStrategy):
         )
     
     def update_book_snapshot(self, bids: list, asks: list):
-        """Update book snapshot for feature extraction"""
+        """
+        Update book snapshot for feature extraction
+        
+        Levels stay as the decoded lists: features read only the top five,
+        which is cheaper in Python than converting to ndarrays every tick.
+        """
         self.last_bids = bids
         self.last_asks = asks
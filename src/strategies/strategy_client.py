@@ -2,12 +2,198 @@
 Strategy client that connects to trading interface via WebSocket and REST
 """
 import asyncio
+import aiohttp
 import websockets
-import requests
+from websockets.exceptions import ConnectionClosed
 import json
 import time
-from typing import Optional, Callable
+import traceback
+from contextlib import asynccontextmanager
+from typing import Optional, Callable, List
 from .base_strategy import BaseStrategy, MarketState, Quote
+from .md_ring import MidRing
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    json_loads = orjson.loads
+    
+    def json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    ORJSON_AVAILABLE = False
+    json_loads = json.loads
+    
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Failures a REST call reports as {"error": ...} instead of raising
+# (connection/HTTP errors, timeouts, undecodable bodies)
+REST_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ValueError)
+
+# Order statuses that leave a quote resting on the book
+RESTING_STATUSES = ("active", "partially_filled")
+
+# WebSocket tuning for a single-symbol feed. A short receive queue pushes
+# back on the server (TCP window fills) instead of letting stale ticks pile
+# up client-side, so a slow consumer shows up quickly rather than as
+# hidden latency. Snapshots compress well, so keep permessage-deflate.
+WS_OPTIONS = {
+    "compression": "deflate",
+    "max_queue": 8,
+    "max_size": 2**20,
+    "ping_interval": 10,
+    "ping_timeout": 20,
+    "close_timeout": 1,  # a stale peer won't answer the close handshake
+}
+
+try:
+    from picows import ws_connect, WSListener, WSMsgType
+    PICOWS_AVAILABLE = True
+except ImportError:
+    PICOWS_AVAILABLE = False
+    WSListener = object
+
+
+class _PicowsListener(WSListener):
+    """Pushes data frames into a queue; a bounded queue drops its oldest frame when full"""
+    
+    def __init__(self, queue: asyncio.Queue):
+        super().__init__()
+        self.queue = queue
+    
+    def _push(self, item):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(item)
+    
+    def on_ws_frame(self, transport, frame):
+        if frame.msg_type == WSMsgType.TEXT or frame.msg_type == WSMsgType.BINARY:
+            self._push(frame.get_payload_as_bytes())
+        elif frame.msg_type == WSMsgType.CLOSE:
+            transport.send_close(frame.get_close_code())
+            transport.disconnect()
+    
+    def on_ws_disconnected(self, transport):
+        self._push(None)  # end of stream
+
+
+class _QueueStream:
+    """Async iterator over queued messages, ending at None (mirrors websockets' async for)"""
+    
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> bytes:
+        message = await self.queue.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+@asynccontextmanager
+async def open_ws(url: str, client_lib: str = "websockets", drop_oldest: bool = False, **kwargs):
+    """
+    Open a WebSocket with the given client library
+    
+    Yields an async-iterable of messages. kwargs override WS_OPTIONS for
+    websockets.connect. picows connections queue frames without limit, or
+    with drop_oldest (market data only: a newer snapshot supersedes an older
+    one) in a queue of max_queue frames that drops the oldest when full.
+    """
+    options = {**WS_OPTIONS, **kwargs}
+    if client_lib == "picows":
+        queue = asyncio.Queue(maxsize=options["max_queue"] if drop_oldest else 0)
+        transport, _ = await ws_connect(lambda: _PicowsListener(queue), url)
+        try:
+            yield _QueueStream(queue)
+        finally:
+            transport.disconnect()
+    else:
+        async with websockets.connect(url, **options) as ws:
+            yield ws
+
+
+class MarketDataHub:
+    """
+    One market-data WebSocket shared by every StrategyClient in a process
+    
+    Each frame is parsed once and the dict is pushed to every subscriber's
+    queue (drop-oldest), instead of N clients each holding an identical feed.
+    Subscribers share the dict, so treat it as read-only. Run hub.run()
+    alongside the clients' run(). With a MidRing, top of book is also
+    written to shared memory for strategies in other processes.
+    """
+    
+    def __init__(
+        self,
+        ws_md_url: str = "ws://127.0.0.1:8000/ws/md",
+        client_lib: str = "websockets",
+        queue_size: int = 8,
+        ring: Optional[MidRing] = None
+    ):
+        if client_lib not in ("websockets", "picows"):
+            raise ValueError(f"Unknown client_lib: {client_lib}")
+        if client_lib == "picows" and not PICOWS_AVAILABLE:
+            print("picows not installed, using websockets")
+            client_lib = "websockets"
+        self.ws_md_url = ws_md_url
+        self.client_lib = client_lib
+        self.queue_size = queue_size
+        self.ring = ring
+        self.subscribers: List[asyncio.Queue] = []
+        self.running = False
+    
+    @asynccontextmanager
+    async def subscribe(self):
+        """Yield an async-iterable of parsed snapshots for one client"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.append(queue)
+        try:
+            yield _QueueStream(queue)
+        finally:
+            self.subscribers.remove(queue)
+    
+    def _publish(self, md: Optional[dict]):
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(md)
+    
+    async def run(self):
+        """Read the feed and fan snapshots out until it closes or stop() is called"""
+        self.running = True
+        try:
+            async with open_ws(self.ws_md_url, self.client_lib, drop_oldest=True) as md_ws:
+                async for message in md_ws:
+                    if not self.running:
+                        break
+                    try:
+                        md = json_loads(message)
+                    except json.JSONDecodeError:
+                        continue
+                    self._publish(md)
+                    if self.ring is not None:
+                        self.ring.write(
+                            md.get("timestamp", time.time()), md.get("mid"),
+                            md.get("best_bid"), md.get("best_ask")
+                        )
+        except ConnectionClosed:
+            print("Market data hub WebSocket closed")
+        except Exception as e:
+            print(f"Error in market data hub: {e}")
+        finally:
+            self.running = False
+            self._publish(None)  # end every subscriber's stream
+    
+    def stop(self):
+        """Stop the hub"""
+        self.running = False
 
 
 class StrategyClient:
@@ -20,17 +206,76 @@ class StrategyClient:
         strategy: BaseStrategy,
         api_base: str = "http://127.0.0.1:8000",
         ws_md_url: str = "ws://127.0.0.1:8000/ws/md",
-        ws_fills_url: str = "ws://127.0.0.1:8000/ws/fills"
+        ws_fills_url: str = "ws://127.0.0.1:8000/ws/fills",
+        client_lib: str = "websockets",
+        tick_size: float = 0.01,
+        md_stale_timeout: float = 10.0,
+        batch_interval_ms: int = 10,
+        hub: Optional[MarketDataHub] = None,
+        md_ring: Optional[MidRing] = None
     ):
+        """
+        Args:
+            client_lib: WebSocket client, "websockets" or "picows" (Cython,
+                lower per-frame cost; falls back to websockets if not installed)
+            tick_size: Mid moves smaller than half a tick do not trigger a requote
+            md_stale_timeout: Reconnect the md WebSocket after this many seconds
+                without a snapshot (pings alone don't count)
+            batch_interval_ms: After a snapshot arrives, wait this long for the
+                burst to settle and quote off the newest one
+            hub: Shared market-data feed; if given, run() subscribes to it
+                instead of opening its own md WebSocket
+            md_ring: Shared-memory top of book written by a MarketDataHub in
+                another process; read instead of the md WebSocket (no depth)
+        """
+        if client_lib not in ("websockets", "picows"):
+            raise ValueError(f"Unknown client_lib: {client_lib}")
+        if client_lib == "picows" and not PICOWS_AVAILABLE:
+            print("picows not installed, using websockets")
+            client_lib = "websockets"
+        
         self.strategy = strategy
+        self.client_lib = client_lib
+        self.tick_size = tick_size
+        self.md_stale_timeout = md_stale_timeout
+        self.batch_interval_ms = batch_interval_ms
+        self.hub = hub
+        self.md_ring = md_ring
         self.api_base = api_base
         self.ws_md_url = ws_md_url
         self.ws_fills_url = f"{ws_fills_url}/{strategy.client_id}"
         
         self.active_orders = {}  # order_id -> order info
         self.running = False
+        self.use_replace_quotes = True  # cleared if the server lacks /replace_quotes
+        self.use_cancel_batch = True  # cleared if the server lacks /cancel_batch
+        
+        # Raw fill messages, parsed and applied by _drain_fills off the recv loop
+        self.fills_q: asyncio.Queue = asyncio.Queue(maxsize=256)
+        
+        # Newest market-data snapshot, set by run()'s reader task
+        self.latest_md: Optional[dict] = None
+        self.md_event: Optional[asyncio.Event] = None
+        self._last_data_ts = 0.0  # monotonic time of the last snapshot with a mid
+        
+        # Keep-alive HTTP session, opened by run() on its event loop
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.request_timeout = aiohttp.ClientTimeout(total=1.0)
+    
+    def _open_session(self) -> aiohttp.ClientSession:
+        """Create the pooled REST session if it is not already open"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+    
+    async def _close_session(self):
+        """Close the REST session"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
     
-    def post_order(self, side: str, order_type: str, price: Optional[float], size: int) -> dict:
+    async def post_order(self, side: str, order_type: str, price: Optional[float], size: int) -> dict:
         """Submit order via REST API"""
         url = f"{self.api_base}/order"
         payload = {
@@ -43,27 +288,131 @@ class StrategyClient:
             payload["price"] = price
         
         try:
-            response = requests.post(url, json=payload, timeout=5)
-            return response.json()
-        except Exception as e:
+            async with self._open_session().post(
+                url, data=json_dumps(payload), headers=JSON_HEADERS, timeout=self.request_timeout
+            ) as response:
+                return await response.json(loads=json_loads)
+        except REST_ERRORS as e:
             print(f"Error posting order: {e}")
             return {"error": str(e)}
     
-    def cancel_order(self, order_id: str) -> dict:
+    async def cancel_order(self, order_id: str) -> dict:
         """Cancel order via REST API"""
         url = f"{self.api_base}/cancel/{order_id}"
         try:
-            response = requests.post(url, timeout=5)
-            return response.json()
-        except Exception as e:
+            async with self._open_session().post(url, timeout=self.request_timeout) as response:
+                return await response.json(loads=json_loads)
+        except REST_ERRORS as e:
             print(f"Error canceling order: {e}")
             return {"error": str(e)}
     
-    async def handle_fills(self, ws: websockets.WebSocketClientProtocol):
-        """Handle fill notifications from WebSocket"""
+    def connect_ws(self, url: str, drop_oldest: bool = False, **kwargs):
+        """Open a WebSocket with the configured client library (see open_ws)"""
+        return open_ws(url, self.client_lib, drop_oldest, **kwargs)
+    
+    async def cancel_batch(self, order_ids: List[str]) -> Optional[dict]:
+        """
+        Cancel several orders in one REST call
+        
+        Returns None if the server has no /cancel_batch endpoint.
+        """
+        url = f"{self.api_base}/cancel_batch"
+        try:
+            async with self._open_session().post(
+                url, data=json_dumps({"order_ids": order_ids}), headers=JSON_HEADERS,
+                timeout=self.request_timeout
+            ) as response:
+                if response.status == 404:
+                    return None
+                return await response.json(loads=json_loads)
+        except REST_ERRORS as e:
+            print(f"Error canceling orders: {e}")
+            return {"error": str(e)}
+    
+    async def cancel_orders(self, order_ids: List[str]) -> bool:
+        """Cancel orders via /cancel_batch, or one call each if the server lacks it"""
+        if self.use_cancel_batch:
+            resp = await self.cancel_batch(order_ids)
+            if resp is not None:
+                return "canceled" in resp
+            self.use_cancel_batch = False
+        
+        resps = await asyncio.gather(*[self.cancel_order(oid) for oid in order_ids])
+        return not any("error" in resp for resp in resps)
+    
+    async def replace_quotes(self, quote: Quote) -> Optional[dict]:
+        """
+        Swap this client's resting quotes for a new bid/ask in one REST call
+        
+        Returns None if the server has no /replace_quotes endpoint.
+        """
+        url = f"{self.api_base}/replace_quotes"
+        payload = {
+            "client_id": self.strategy.client_id,
+            "bid": {"price": quote.bid_price, "size": quote.bid_size},
+            "ask": {"price": quote.ask_price, "size": quote.ask_size}
+        }
+        
+        try:
+            async with self._open_session().post(
+                url, data=json_dumps(payload), headers=JSON_HEADERS, timeout=self.request_timeout
+            ) as response:
+                if response.status == 404:
+                    return None
+                return await response.json(loads=json_loads)
+        except REST_ERRORS as e:
+            print(f"Error replacing quotes: {e}")
+            return {"error": str(e)}
+    
+    async def requote(self, quote: Quote):
+        """Replace the resting quotes with the given bid/ask"""
+        if self.use_replace_quotes:
+            resp = await self.replace_quotes(quote)
+            if resp is not None:
+                self.active_orders.clear()
+                self._track_resting(resp.get("bid") or {}, "buy", quote.bid_price)
+                self._track_resting(resp.get("ask") or {}, "sell", quote.ask_price)
+                return
+            self.use_replace_quotes = False
+        
+        # Cancel old orders (kept if the cancel call itself failed, to retry next tick)
+        if self.active_orders:
+            if not await self.cancel_orders(list(self.active_orders)):
+                return
+            self.active_orders.clear()
+        
+        # Submit new quotes (bid and ask in flight together)
+        bid_resp, ask_resp = await asyncio.gather(
+            self.post_order("buy", "limit", quote.bid_price, quote.bid_size),
+            self.post_order("sell", "limit", quote.ask_price, quote.ask_size)
+        )
+        
+        self._track_resting(bid_resp, "buy", quote.bid_price)
+        self._track_resting(ask_resp, "sell", quote.ask_price)
+    
+    def _track_resting(self, resp: dict, side: str, price: float):
+        """Record an order in active_orders only if it is resting (not filled or rejected)"""
+        if resp.get("order_id") and resp.get("status") in RESTING_STATUSES:
+            self.active_orders[resp["order_id"]] = {"side": side, "price": price}
+    
+    async def handle_fills(self, ws):
+        """Queue fill notifications from WebSocket for _drain_fills"""
         try:
             async for message in ws:
-                data = json.loads(message)
+                # Fills can't be dropped without corrupting inventory, so a
+                # full queue blocks the reader (TCP backpressure) instead
+                await self.fills_q.put(message)
+        except ConnectionClosed:
+            print("Fills WebSocket closed")
+        except Exception as e:
+            print(f"Error in fills handler: {e}")
+    
+    async def _drain_fills(self):
+        """Parse queued fill messages and apply them to the strategy"""
+        while True:
+            message = await self.fills_q.get()
+            try:
+                data = json_loads(message)
                 if data.get("event") == "fill":
                     # Update strategy inventory
                     side = data["side"]
@@ -75,86 +424,186 @@ class StrategyClient:
                     if order_id in self.active_orders:
                         # Check if order is fully filled (would need to query order status)
                         pass
-        except websockets.exceptions.ConnectionClosed:
-            print("Fills WebSocket closed")
-        except Exception as e:
-            print(f"Error in fills handler: {e}")
+            except Exception as e:
+                print(f"Error in fills handler: {e}")
+    
+    def on_market_data(self, md: dict):
+        """Hook for subclasses: called with each snapshot before quoting"""
+        pass
+    
+    async def read_market_data(self, md_ws):
+        """Keep only the newest market-data snapshot; stale ticks are overwritten"""
+        async for message in md_ws:
+            if isinstance(message, dict):
+                md = message  # already parsed by a MarketDataHub
+            else:
+                # Parsed inline even for big books: json_loads holds the GIL, so
+                # asyncio.to_thread adds ~40us per frame without freeing the loop
+                try:
+                    md = json_loads(message)
+                except json.JSONDecodeError:
+                    continue
+            if "mid" in md:
+                self._last_data_ts = time.monotonic()
+            self.latest_md = md
+            self.md_event.set()
+    
+    async def watch_market_data(self):
+        """Return once no snapshot has arrived for md_stale_timeout seconds"""
+        while True:
+            delay = self._last_data_ts + self.md_stale_timeout - time.monotonic()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+    
+    async def quote_loop(self, quote_interval: float):
+        """
+        Quote off the newest snapshot at most once per quote_interval
+        
+        Quotes are scheduled on a monotonic deadline, so REST latency eats
+        into the interval instead of being added on top of it.
+        """
+        # One market state, refreshed in place every tick
+        market_state = MarketState(mid=0.0, best_bid=None, best_ask=None, spread=None, timestamp=0.0)
+        strategy = self.strategy
+        half_tick = self.tick_size / 2
+        batch_interval = self.batch_interval_ms / 1000
+        last_mid = None
+        last_inventory = None
+        next_quote_ts = time.monotonic()
+        
+        while self.running:
+            # Wait for a snapshot newer than the last one quoted
+            await self.md_event.wait()
+            if batch_interval > 0:
+                # Coalesce a burst of ticks into one requote
+                await asyncio.sleep(batch_interval)
+            self.md_event.clear()
+            md = self.latest_md
+            get = md.get
+            mid = get("mid")
+            if mid is None:
+                continue  # empty or one-sided book: nothing to quote around
+            inventory = strategy.inventory
+            
+            # Quotes still resting and neither mid nor inventory moved: nothing to do
+            if (
+                self.active_orders
+                and inventory == last_inventory
+                and last_mid is not None
+                and abs(mid - last_mid) < half_tick
+            ):
+                continue
+            
+            try:
+                self.on_market_data(md)
+                
+                # Refresh market state
+                market_state.mid = mid
+                market_state.best_bid = get("best_bid")
+                market_state.best_ask = get("best_ask")
+                market_state.spread = get("spread")
+                market_state.timestamp = get("timestamp", time.time())
+                market_state.inventory = inventory
+                market_state.position = strategy.position
+                market_state.realized_pnl = strategy.realized_pnl
+                market_state.unrealized_pnl = strategy.unrealized_pnl
+                
+                # Compute quotes
+                quote = strategy.compute_quotes(market_state)
+                
+                # Replace resting quotes
+                await self.requote(quote)
+                last_mid = mid
+                last_inventory = inventory
+            except (KeyError, ValueError, aiohttp.ClientError) as e:
+                print(f"Error in strategy loop: {e}")
+            
+            # Wait for the next quote slot; snapshots arriving meanwhile just replace latest_md
+            next_quote_ts += quote_interval
+            delay = next_quote_ts - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Fell behind (slow round trip or idle feed): restart the cadence, don't burst
+                next_quote_ts = time.monotonic()
     
     async def run(self, quote_interval: float = 0.5):
         """
         Main strategy loop: subscribe to market data, compute quotes, submit orders
+        
+        A reader task keeps the newest snapshot in latest_md while the quoter
+        requotes from it, so ticks arriving during a REST round trip replace
+        each other instead of queueing up in the socket.
         """
         self.running = True
+        self._open_session()
+        self.latest_md = None
+        self.md_event = asyncio.Event()
         
         # Connect to fills WebSocket
         fills_task = None
+        drain_task = asyncio.create_task(self._drain_fills())
         try:
-            async with websockets.connect(self.ws_fills_url) as fills_ws:
+            async with self.connect_ws(self.ws_fills_url) as fills_ws:
                 fills_task = asyncio.create_task(self.handle_fills(fills_ws))
                 
-                # Connect to market data WebSocket
+                # Connect to market data WebSocket; reconnect if the feed goes silent
                 try:
-                    async with websockets.connect(self.ws_md_url) as md_ws:
-                        print(f"Strategy {self.strategy.client_id} connected")
-                        
-                        async for message in md_ws:
-                            if not self.running:
-                                break
+                    while self.running:
+                        if self.hub is not None:
+                            md_source = self.hub.subscribe()
+                        elif self.md_ring is not None:
+                            md_source = self.md_ring.subscribe(max_age=self.md_stale_timeout)
+                        else:
+                            md_source = self.connect_ws(self.ws_md_url, drop_oldest=True)
+                        async with md_source as md_ws:
+                            print(f"Strategy {self.strategy.client_id} connected")
+                            self._last_data_ts = time.monotonic()
                             
+                            reader = asyncio.create_task(self.read_market_data(md_ws))
+                            quoter = asyncio.create_task(self.quote_loop(quote_interval))
+                            watchdog = asyncio.create_task(self.watch_market_data())
                             try:
-                                md = json.loads(message)
-                                
-                                # Build market state
-                                market_state = MarketState(
-                                    mid=md.get("mid", 0.0),
-                                    best_bid=md.get("best_bid"),
-                                    best_ask=md.get("best_ask"),
-                                    spread=md.get("spread"),
-                                    timestamp=md.get("timestamp", time.time()),
-                                    inventory=self.strategy.inventory,
-                                    position=self.strategy.position,
-                                    realized_pnl=self.strategy.realized_pnl,
-                                    unrealized_pnl=self.strategy.unrealized_pnl
+                                done, _ = await asyncio.wait(
+                                    {reader, quoter, watchdog}, return_when=asyncio.FIRST_COMPLETED
                                 )
-                                
-                                # Compute quotes
-                                quote = self.strategy.compute_quotes(market_state)
-                                
-                                # Cancel old orders
-                                for order_id in list(self.active_orders.keys()):
-                                    self.cancel_order(order_id)
-                                self.active_orders.clear()
-                                
-                                # Submit new quotes
-                                bid_resp = self.post_order("buy", "limit", quote.bid_price, quote.bid_size)
-                                ask_resp = self.post_order("sell", "limit", quote.ask_price, quote.ask_size)
-                                
-                                if "order_id" in bid_resp:
-                                    self.active_orders[bid_resp["order_id"]] = {"side": "buy", "price": quote.bid_price}
-                                if "order_id" in ask_resp:
-                                    self.active_orders[ask_resp["order_id"]] = {"side": "sell", "price": quote.ask_price}
-                                
-                                # Wait before next quote update
-                                await asyncio.sleep(quote_interval)
-                                
-                            except json.JSONDecodeError:
+                            finally:
+                                reader.cancel()
+                                quoter.cancel()
+                                watchdog.cancel()
+                            
+                            if watchdog in done:
+                                print(f"No market data for {self.md_stale_timeout:.0f}s, reconnecting")
+                                if hasattr(md_ws, "close"):
+                                    await md_ws.close(code=1012)  # service restart
                                 continue
-                            except Exception as e:
-                                print(f"Error in strategy loop: {e}")
-                                await asyncio.sleep(quote_interval)
+                            
+                            # A quoter failure is a strategy bug, not a feed problem: report and stop
+                            if quoter in done and quoter.exception() is not None:
+                                print("Strategy loop failed:")
+                                traceback.print_exception(quoter.exception())
+                                break
+                            
+                            # Surface a closed connection from the reader
+                            for task in done:
+                                task.result()
+                        break
                 
-                except websockets.exceptions.ConnectionClosed:
+                except ConnectionClosed:
                     print("Market data WebSocket closed")
                 except Exception as e:
                     print(f"Error connecting to market data: {e}")
         
-        except websockets.exceptions.ConnectionClosed:
+        except ConnectionClosed:
             print("Fills WebSocket closed")
         except Exception as e:
             print(f"Error connecting to fills: {e}")
         finally:
             if fills_task:
                 fills_task.cancel()
+            drain_task.cancel()
+            await self._close_session()
             self.running = False
     
     def stop(self):
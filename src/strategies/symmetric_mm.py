@@ -1,7 +1,7 @@
 """
 Symmetric Market Maker: Posts quotes symmetrically around mid
 """
-from .base_strategy import BaseStrategy, Quote, MarketState
+from .base_strategy import BaseStrategy, Quote, MarketState, TICKS_PER_UNIT
 
 
 class SymmetricMarketMaker(BaseStrategy):
@@ -14,16 +14,25 @@ class SymmetricMarketMaker(BaseStrategy):
         self.half_spread = half_spread
         self.quote_size = quote_size
     
+    @property
+    def half_spread(self) -> float:
+        return self._half_spread
+    
+    @half_spread.setter
+    def half_spread(self, value: float):
+        # Kept in whole ticks too, so quotes only need the mid rounded to the grid
+        self._half_spread = value
+        self.half_spread_ticks = int(value * TICKS_PER_UNIT + 0.5)
+    
     def compute_quotes(self, market_state: MarketState) -> Quote:
         """Compute symmetric quotes around mid"""
-        mid = market_state.mid
-        
-        bid_price = round(mid - self.half_spread, 2)
-        ask_price = round(mid + self.half_spread, 2)
+        mid_ticks = int(market_state.mid * TICKS_PER_UNIT + 0.5)
+        half_spread_ticks = self.half_spread_ticks
+        quote_size = self.quote_size
         
         return Quote(
-            bid_price=bid_price,
-            ask_price=ask_price,
-            bid_size=self.quote_size,
-            ask_size=self.quote_size
+            (mid_ticks - half_spread_ticks) / TICKS_PER_UNIT,
+            (mid_ticks + half_spread_ticks) / TICKS_PER_UNIT,
+            quote_size,
+            quote_size
         )